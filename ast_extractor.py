@@ -1,35 +1,723 @@
 # -*- coding: utf-8 -*-
+import bisect
 import datetime
+import hashlib
+import io
 import javalang
 import json
 import os
+import pickle
 import re
-from call_graph import CallGraph
+import sys
+from call_graph import CallGraph, EXCLUDE_PREFIXES
 import logging
 from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # xxhash 为可选依赖，未安装时使用 hashlib.blake2b
+    xxhash = None
+
+def _read_source_bytes(full_path):
+    """以二进制方式一次读出整个源文件"""
+    with open(full_path, 'rb') as f:
+        return f.read()
+
+
+def _decode_source(data):
+    """把源文件内容解码为文本，无法解码的字节用替换字符代替，不让单个字符导致整个文件无法分析"""
+    return data.decode('utf-8', 'replace')
+
+
+def _source_digest(data):
+    """计算源文件内容（字节）的哈希，作为AST磁盘缓存的键"""
+    if xxhash is not None:
+        return 'xxh64-' + xxhash.xxh64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _child_nodes(node):
+    """按属性顺序返回节点的直接子节点，列表（包括嵌套列表）会被展开"""
+    children = []
+    pending = [getattr(node, attr) for attr in reversed(node.attrs)]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, javalang.ast.Node):
+            children.append(value)
+        elif isinstance(value, (list, tuple)):
+            pending.extend(reversed(value))
+    return children
+
+
+def _walk_tree(root):
+    """以迭代方式先序遍历AST，产出 (祖先节点元组, 节点)
+
+    遍历顺序与 javalang 的 Node.filter 一致，但不使用逐层嵌套的递归生成器，
+    路径中也只包含节点而不包含中间的列表。
+    """
+    stack = [((), root)]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        path, node = pop()
+        yield path, node
+        child_path = path + (node,)
+        extend([(child_path, child) for child in reversed(_child_nodes(node))])
+
+
+def _max_position_line(root, default):
+    """返回 root 及其所有子节点中最大的行号
+
+    只关心最大值而不关心顺序，因此直接用栈展开属性值，不构造子节点列表也不保持先序。
+    """
+    max_line = default
+    Node = javalang.ast.Node
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, Node):
+            position = value.position
+            if position and position.line > max_line:
+                max_line = position.line
+            stack.extend(getattr(value, attr) for attr in value.attrs)
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return max_line
+
+
+def _path_to_str(path):
+    """将包名或导入路径转换为点分字符串
+
+    javalang 通常直接给出字符串，列表形式时逐项取 value。
+    """
+    if isinstance(path, str):
+        return path
+    if isinstance(path, list):
+        return '.'.join(str(getattr(p, 'value', p)) for p in path)
+    return str(path)
+
+
+# 不包含方法声明、无需解析的Java文件
+_SKIPPED_JAVA_FILES = frozenset({'package-info.java', 'module-info.java'})
+
+# 遍历源码目录时默认跳过的目录：版本控制、IDE、构建输出和前端依赖目录。
+# 只在 src_root 的直接子目录中匹配，更深层的同名目录可能是Java包（如 com/ex/build）
+DEFAULT_SKIPPED_DIRS = frozenset({'.git', '.svn', '.idea', '.gradle', 'target', 'build', 'out', 'node_modules'})
+
+# Maven/Gradle 约定的源码目录，推测包名时去掉它及之前的部分
+_SOURCE_ROOT_MARKERS = ('main/java/', 'test/java/')
+
+
+def _guess_package_path(rel_path):
+    """根据相对路径粗略推测文件的点分包路径
+
+    只有路径中出现约定的源码目录时才能推测，如
+    'src/main/java/java/util/List.java' -> 'java.util.List.java'。
+    否则无法确定包路径从哪一级目录开始（src_root 可能是源码目录本身，也可能是
+    src/main 等中间目录），返回None。
+    """
+    for marker in _SOURCE_ROOT_MARKERS:
+        index = rel_path.find(marker)
+        if index == 0 or (index > 0 and rel_path[index - 1] == '/'):
+            return rel_path[index + len(marker):].replace('/', '.')
+    return None
+
+
+# 方法调用或构造函数调用在源码中的最小文本特征：标识符或泛型右尖括号后跟左括号，
+# 如 foo(、 new Foo(、 new Foo<>(。匹配不到的文件不可能包含调用
+_CALL_RE = re.compile(r'[\w>]\s*\(')
+
+# git diff 的文件头和块头
+_DIFF_FILE_RE = re.compile(r'diff --git (?:src://)?(.+?) (?:dst://)?.*')
+_DIFF_HUNK_RE = re.compile(r'@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@')
+
+
+# 修饰符组合的共享实例，相同的修饰符组合只保留一个 frozenset
+# Java 修饰符到位掩码的映射，用于快速查找共享的修饰符集合
+_MODIFIER_BITS = {
+    'public': 1, 'private': 2, 'protected': 4, 'static': 8, 'final': 16, 'abstract': 32,
+    'synchronized': 64, 'native': 128, 'volatile': 256, 'transient': 512, 'strictfp': 1024,
+    'default': 2048,
+}
+
+_MODIFIER_SETS = {}  # 位掩码（或含未知修饰符时的 frozenset）-> 共享的修饰符 frozenset
+
+
+def _modifier_set(modifiers):
+    """返回与给定修饰符相同的共享 frozenset
+
+    常见修饰符组合按位掩码查找，命中时不必为每个方法新建集合。
+    """
+    mask = 0
+    for modifier in modifiers:
+        bit = _MODIFIER_BITS.get(modifier)
+        if bit is None:
+            # 出现位掩码无法表示的修饰符时退回以集合本身为键
+            key = frozenset(modifiers)
+            return _MODIFIER_SETS.setdefault(key, key)
+        mask |= bit
+    shared = _MODIFIER_SETS.get(mask)
+    if shared is None:
+        shared = _MODIFIER_SETS[mask] = frozenset(modifiers)
+    return shared
+
+
+_MODIFIER_STRINGS = {}  # 共享的修饰符 frozenset -> 签名中的修饰符字符串
+
+
+def _modifier_string(modifiers):
+    """返回方法签名中使用的修饰符字符串（按字母顺序以空格连接）
+
+    每种修饰符组合只排序、拼接一次，之后直接查表。
+    """
+    shared = _modifier_set(modifiers)
+    text = _MODIFIER_STRINGS.get(shared)
+    if text is None:
+        text = _MODIFIER_STRINGS[shared] = ' '.join(sorted(shared))
+    return text
+
+
+def _index_method_name(method_index, qualified_name, param_types):
+    """按重载规则确定方法在索引中的名称
+
+    名称已被索引中的其他条目占用且方法有参数时，在名称后追加参数类型；
+    没有参数的方法仍使用原名称。
+
+    Args:
+        method_index: 方法索引
+        qualified_name: 类型名.方法名
+        param_types: 返回参数类型名列表的函数，只在名称冲突时调用
+
+    Returns:
+        str: 驻留后的索引名称
+    """
+    if qualified_name in method_index:
+        types = param_types()
+        if types:
+            qualified_name = f"{qualified_name}({','.join(types)})"
+    return sys.intern(qualified_name)
+
+
+def _strip_varargs(param_type):
+    """去掉可变参数类型末尾的 '...'，得到重载名中使用的参数类型"""
+    return param_type[:-3] if param_type.endswith('...') else param_type
+
+
+def _intern_calls(calls):
+    """驻留调用关系中的方法名
+
+    子进程返回或从缓存文件读取的结果经过 pickle，同名的调用者/被调用者在不同文件的结果中
+    各自是独立的字符串对象；合并前驻留后，调用图中每个方法名只保留一份。
+
+    Args:
+        calls: (调用者, 被调用者) 元组的可迭代对象
+
+    Returns:
+        list: 驻留后的 (调用者, 被调用者) 列表
+    """
+    intern = sys.intern
+    return [(intern(caller), intern(callee)) for caller, callee in calls]
+
+
+_LINE_NUMBERS = {}  # 行号 -> 共享的 int 对象
+
+
+def _line_number(line):
+    """返回与给定行号相等的共享 int 对象
+
+    CPython 只缓存 -5~256 的小整数，更大的行号每个方法都会各自持有一个 int 对象；
+    不同文件中的方法起止行大量重复，共享后索引中每个行号只保留一份。
+    """
+    if line is None:
+        return None
+    return _LINE_NUMBERS.setdefault(line, line)
+
+
+# 解析方法调用时直接按 java.lang 处理的常见标准库类型。
+# 比 call_graph 中按名称过滤标准库调用用的集合小：解析时这些类型优先于局部变量、字段和导入，
+# 一律解析为 java.lang.<类型名>，因此不包括 PrintStream、Scanner、Date 等其他包中、
+# 项目里也常有同名类的类型，它们仍按导入和同包类正常解析
+_RESOLVER_JAVA_TYPES = frozenset({
+    # 基础类型
+    'Object', 'String', 'Integer', 'Long', 'Double', 'Float', 'Boolean', 'Byte', 'Short', 'Character',
+
+    # 异常类型
+    'Exception', 'RuntimeException', 'IllegalArgumentException', 'NullPointerException',
+    'IllegalStateException', 'UnsupportedOperationException', 'IndexOutOfBoundsException',
+    'NoSuchElementException', 'ClassCastException', 'ArrayIndexOutOfBoundsException',
+
+    # 集合类型
+    'List', 'ArrayList', 'LinkedList', 'Set', 'HashSet', 'Map', 'HashMap', 'TreeMap',
+    'Collection', 'Collections', 'Arrays', 'Iterator', 'Iterable',
+
+    # 其他常用类型
+    'StringBuilder', 'StringBuffer', 'Math', 'System', 'Class', 'Thread', 'Runnable',
+    'Optional', 'Stream', 'Collectors', 'Objects'
+})
+
+# 标准库类的简单名到完整限定名的映射
+_STANDARD_LIB_CLASSES = {
+    'Object': 'java.lang.Object',
+    'String': 'java.lang.String',
+    'Integer': 'java.lang.Integer',
+    'Long': 'java.lang.Long',
+    'Double': 'java.lang.Double',
+    'Float': 'java.lang.Float',
+    'Boolean': 'java.lang.Boolean',
+    'Byte': 'java.lang.Byte',
+    'Short': 'java.lang.Short',
+    'Character': 'java.lang.Character',
+    'System': 'java.lang.System',
+    'Thread': 'java.lang.Thread',
+    'Exception': 'java.lang.Exception',
+    'RuntimeException': 'java.lang.RuntimeException',
+    'Throwable': 'java.lang.Throwable',
+    'Class': 'java.lang.Class',
+    'Math': 'java.lang.Math',
+    'StringBuilder': 'java.lang.StringBuilder',
+    'StringBuffer': 'java.lang.StringBuffer'
+}
+
+
+_DECLARATION_TYPES = (javalang.tree.MethodDeclaration, javalang.tree.ConstructorDeclaration)
+# 可以作为方法调用上下文的节点类型，Lambda 也可能是一个方法上下文
+_METHOD_CONTEXT_TYPES = _DECLARATION_TYPES + (javalang.tree.LambdaExpression,)
+# 方法所属的类型声明节点
+_CLASS_CONTEXT_TYPES = (javalang.tree.ClassDeclaration, javalang.tree.InterfaceDeclaration)
+# 沿祖先路径查找时按精确类型查集合，比对每个祖先做 isinstance 元组检查快得多
+# （javalang 中这些节点类型都没有子类）
+_METHOD_CONTEXT_TYPE_SET = frozenset(_METHOD_CONTEXT_TYPES)
+_CLASS_CONTEXT_TYPE_SET = frozenset(_CLASS_CONTEXT_TYPES)
+
+
+class _EndLineTracker:
+    """在一次先序遍历中计算所有方法/构造函数的结束行号
+
+    先序遍历时一个节点的子树是连续的一段，遇到深度不大于它的节点即表示子树结束，
+    因此只需维护尚未结束的声明栈，不必再对每个方法单独遍历子树。
+    """
+    __slots__ = ('end_lines', '_open')
+
+    def __init__(self):
+        self.end_lines = {}  # 声明节点 -> 结束行号，以节点本身为键，节点不会被提前释放
+        self._open = []  # [深度, 节点, 当前最大行号]
+
+    def visit(self, depth, node):
+        open_decls = self._open
+        while open_decls and open_decls[-1][0] >= depth:
+            self._close()
+        position = node.position
+        if not position:
+            return
+        if isinstance(node, _DECLARATION_TYPES):
+            open_decls.append([depth, node, position.line])
+        elif open_decls:
+            top = open_decls[-1]
+            if position.line > top[2]:
+                top[2] = position.line
+
+    def _close(self):
+        _, node, max_line = self._open.pop()
+        # 与 _find_node_end_line 一致，结束行号包括结束大括号
+        self.end_lines[node] = max_line + 1
+        if self._open and max_line > self._open[-1][2]:
+            self._open[-1][2] = max_line
+
+    def finish(self):
+        while self._open:
+            self._close()
+        return self.end_lines
+
+
+@dataclass
+class _FileDeclarations:
+    """一次遍历收集到的声明节点，以及方法/构造函数的结束行号"""
+    methods: list = field(default_factory=list)
+    constructors: list = field(default_factory=list)
+    fields: list = field(default_factory=list)
+    end_lines: dict = field(default_factory=dict)
+
+
+def _collect_declarations(root, parent_map=None):
+    """只遍历一次 root，按类型收集方法、构造函数和字段声明，同时计算结束行号
+
+    收集顺序与 javalang 的 Node.filter 一致。给出 parent_map 时，
+    顺便把方法声明的父节点以 id(方法节点) 为键记录进去。
+    """
+    declarations = _FileDeclarations()
+    tracker = _EndLineTracker()
+    for path, node in _walk_tree(root):
+        tracker.visit(len(path), node)
+        if isinstance(node, javalang.tree.MethodDeclaration):
+            declarations.methods.append(node)
+            if parent_map is not None and path:
+                parent_map[id(node)] = path[-1]
+        elif isinstance(node, javalang.tree.ConstructorDeclaration):
+            declarations.constructors.append(node)
+        elif isinstance(node, javalang.tree.FieldDeclaration):
+            declarations.fields.append(node)
+    declarations.end_lines = tracker.finish()
+    return declarations
+
+
+def _end_line_by_braces(source_lines, start_line):
+    """从方法声明所在行开始配对花括号，返回方法体右花括号所在的行号
+
+    括号内（如注解参数）的花括号、字符串/字符字面量和注释中的花括号不计入。
+    方法体开始后，不含引号和斜杠的行直接用 str.count 统计，只有其余行才逐字符扫描。
+
+    Args:
+        source_lines: 源文件的行列表
+        start_line: 方法声明所在行号（从1开始）
+
+    Returns:
+        int: 右花括号所在行号；方法没有方法体（以分号结束）或无法配对时返回None
+    """
+    depth = 0
+    parens = 0
+    opened = False
+    in_comment = False
+    for index in range(start_line - 1, len(source_lines)):
+        line = source_lines[index]
+        if opened and not in_comment and '"' not in line and "'" not in line and '/' not in line:
+            depth += line.count('{') - line.count('}')
+            if depth <= 0:
+                return index + 1
+            continue
+
+        i = 0
+        length = len(line)
+        while i < length:
+            ch = line[i]
+            if in_comment:
+                comment_end = line.find('*/', i)
+                if comment_end < 0:
+                    break
+                in_comment = False
+                i = comment_end + 2
+                continue
+            if ch == '/' and line.startswith('//', i):
+                break
+            if ch == '/' and line.startswith('/*', i):
+                in_comment = True
+                i += 2
+                continue
+            if ch == '"' or ch == "'":
+                # 跳过字面量，注意转义字符
+                i += 1
+                while i < length and line[i] != ch:
+                    i += 2 if line[i] == '\\' else 1
+                i += 1
+                continue
+            if not opened:
+                if ch == '(':
+                    parens += 1
+                elif ch == ')':
+                    parens -= 1
+                elif parens == 0:
+                    if ch == ';':
+                        return None
+                    if ch == '{':
+                        opened = True
+                        depth = 1
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    return index + 1
+            i += 1
+    return None
+
+
+def _ranges_touching_lines(ranges, sorted_lines):
+    """找出包含至少一个修改行的行号范围
+
+    修改行较少时，每个范围二分查找第一个不小于起始行的修改行，耗时 O(范围数 * log(修改行数))；
+    修改行多于范围数时，把范围按起始行排序后与修改行双指针归并，耗时 O(范围数 * log(范围数) + 修改行数)。
+
+    Args:
+        ranges: (名称, 起始行, 结束行, ...) 元组的列表
+        sorted_lines: 升序排列的修改行号
+
+    Returns:
+        list: 命中的范围，保持输入顺序
+    """
+    if not sorted_lines:
+        return []
+    line_count = len(sorted_lines)
+    if line_count <= len(ranges):
+        bisect_left = bisect.bisect_left
+        touched = []
+        for item in ranges:
+            index = bisect_left(sorted_lines, item[1])
+            if index < line_count and sorted_lines[index] <= item[2]:
+                touched.append(item)
+        return touched
+
+    # 起始行递增时，第一个不小于起始行的修改行位置也只会向后移动
+    hits = [False] * len(ranges)
+    index = 0
+    for position in sorted(range(len(ranges)), key=lambda i: ranges[i][1]):
+        start_line = ranges[position][1]
+        while index < line_count and sorted_lines[index] < start_line:
+            index += 1
+        if index == line_count:
+            break
+        hits[position] = sorted_lines[index] <= ranges[position][2]
+    return [item for item, hit in zip(ranges, hits) if hit]
+
+
+# 类型声明必然包含的关键字，源码中一个都没有时可以跳过完整解析（@interface 也包含 interface）
+_TYPE_KEYWORDS = ('class', 'interface', 'enum', 'record')
+
+# 头部扫描用的词法规则：注释和字符串/字符字面量整体匹配后丢弃，避免其中的花括号和关键字干扰
+_HEADER_TOKEN_RE = re.compile(
+    r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+    r'|(?P<package>\bpackage\s+(?P<package_name>[\w.\s]+?)\s*;)'
+    r'|(?P<import>\bimport\s+(?P<static>static\s+)?(?P<import_name>[\w.\s]+?(?:\.\s*\*)?)\s*;)'
+    r'|(?P<type>(?<![\w.])(?P<kind>class|interface|enum|@\s*interface|record)\s+(?P<type_name>[A-Za-z_$][\w$]*))'
+    r'|(?P<brace>[{}])',
+    re.DOTALL)
+
+
+@dataclass
+class HeaderInfo:
+    """scan_header 的结果：包名、导入和顶层类型声明"""
+    package: str = None
+    imports: list = field(default_factory=list)  # (完整导入路径, 是否静态导入)
+    types: list = field(default_factory=list)  # (类型种类, 类型名, 起始行, 结束行)
+
+
+def scan_header(source):
+    """只做词法扫描，提取Java源文件的包名、导入语句和顶层类型声明的行号范围
+
+    不构建语法树，耗时与源码长度成线性关系。类型的结束行通过花括号配对得到，
+    只统计深度为0处的声明，因此嵌套类型不会出现在结果中。
+
+    Args:
+        source: Java源码文本
+
+    Returns:
+        HeaderInfo: 扫描结果
+    """
+    header = HeaderInfo()
+    depth = 0
+    line = 1
+    position = 0
+    pending = None  # 已扫描到声明但还未遇到左花括号的顶层类型
+    open_type = None  # 正在扫描其类体的顶层类型
+    for match in _HEADER_TOKEN_RE.finditer(source):
+        group = match.lastgroup
+        if group is None:
+            continue
+        line += source.count('\n', position, match.start())
+        position = match.start()
+        if group == 'brace':
+            if match.group() == '{':
+                if depth == 0 and pending is not None:
+                    open_type, pending = pending, None
+                depth += 1
+            elif depth > 0:
+                depth -= 1
+                if depth == 0 and open_type is not None:
+                    header.types.append(open_type + (line,))
+                    open_type = None
+        elif depth == 0:
+            if group == 'package':
+                header.package = ''.join(match.group('package_name').split())
+            elif group == 'import':
+                header.imports.append((''.join(match.group('import_name').split()),
+                                       match.group('static') is not None))
+            elif group == 'type' and pending is None:
+                kind = match.group('kind')
+                kind = 'annotation' if kind.startswith('@') else kind
+                pending = (kind, match.group('type_name'), line)
+    return header
+
+
+def _empty_compilation_unit(header):
+    """用头部扫描结果构造不含类型声明的编译单元，只保留包名"""
+    package = javalang.tree.PackageDeclaration(name=header.package) if header.package else None
+    return javalang.tree.CompilationUnit(package=package, imports=[], types=[])
+
+
+class _IndexEntry:
+    """method_index 条目的基类
+
+    子类使用 __slots__ 代替字典保存信息以降低内存占用，
+    同时保留 get()/[] 的字典式访问，兼容现有调用方。
+    未设置的字段视为不存在。
+    """
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def _to_dict(self):
+        """转换为字典，用于序列化"""
+        return {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
+    def __getstate__(self):
+        return self._to_dict()
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._to_dict()})"
+
+
+class MethodInfo(_IndexEntry):
+    """方法索引条目"""
+    __slots__ = ('name', 'qualified_name', 'file_path', 'class_name', 'start_line', 'end_line',
+                 'type', 'modifiers', 'parameters', 'return_type', 'throws', 'signature', 'source_code')
+
+
+class TypeInfo(_IndexEntry):
+    """类型索引条目，type 固定为 'class'"""
+    __slots__ = ('file_path', 'package', 'name', 'type', 'methods', 'imports')
+
+
+# 按文件分析结果快照的格式版本，索引结果的结构变化时递增
+_INDEX_SNAPSHOT_VERSION = 2
+
+# 子进程中复用的分析器实例，由 _init_worker 创建
+_worker_extractor = None
+
+
+def _init_worker(src_root, logger_name, use_disk_cache=False):
+    """进程池初始化函数：在子进程中创建独立的分析器实例
+
+    Args:
+        src_root: 源代码根目录
+        logger_name: 主进程日志记录器的名称
+        use_disk_cache: 是否使用AST磁盘缓存
+    """
+    global _worker_extractor
+    _worker_extractor = JavaASTExtractor(logging.getLogger(logger_name), max_workers=1,
+                                         use_disk_cache=use_disk_cache)
+    _worker_extractor.src_root = src_root
+
+
+def _analyze_file_worker(file_path):
+    """子进程任务：用子进程中的分析器实例分析单个文件
+
+    子进程中更新的AST缓存索引不会写回磁盘，本文件的索引条目随结果一起返回，
+    由主进程合并后统一保存。
+
+    Returns:
+        tuple: (_analyze_file_isolated 的结果, 本文件的AST缓存索引条目，没有时为None)
+    """
+    result = _analyze_file_isolated(_worker_extractor, file_path)
+    cache_entry = None
+    if _worker_extractor.use_disk_cache:
+        full_path = _worker_extractor._full_path(os.path.normpath(file_path))
+        cache_entry = _worker_extractor._get_disk_cache_index().get(full_path)
+    return result, cache_entry
+
+
+def _analyze_file_isolated(extractor, file_path):
+    """用独立的分析器实例对单个文件只解析一次，依次完成方法索引和方法调用分析
+
+    调用分析只依赖本文件的导入、字段和局部变量信息，因此可以与索引在同一次
+    任务中完成；调用者是否已在全局索引中由主进程合并时判断。
+
+    Args:
+        extractor: 专门用于逐个文件分析的分析器实例，每个文件开始前清空其状态
+        file_path: 相对于 src_root 的文件路径
+
+    Returns:
+        tuple: (文件路径, 索引结果, 调用分析结果, 错误信息)
+    """
+    extractor._clear_caches()
+    extractor._index_entries = index_entries = []
+    try:
+        extractor._process_file(file_path)
+    except Exception as e:
+        return file_path, None, None, str(e)
+    finally:
+        extractor._index_entries = None
+    indexed_names = set(extractor.method_index)
+    index_result = (index_entries, extractor.import_cache, extractor.method_local_vars)
+
+    extractor._process_file_calls(file_path)
+    new_methods = [(name, info) for name, info in extractor.method_index.items() if name not in indexed_names]
+    calls = [(caller, callee)
+             for caller, edge in extractor.call_graph.edges.items()
+             for callee in edge['callees']]
+    return file_path, index_result, (new_methods, calls, extractor.class_cache), None
+
 
 class JavaASTExtractor:
     """Java代码AST分析器，用于分析Java代码的方法调用关系和修改影响。"""
 
-    def __init__(self, logger=None, analyze_stdlib=False):
+    def __init__(self, logger=None, analyze_stdlib=False, max_workers=1, use_disk_cache=False,
+                 skipped_dirs=DEFAULT_SKIPPED_DIRS):
         """
         初始化AST分析器。
         Args:
             logger: 共享的日志记录器，如果为None则创建新的
             analyze_stdlib: 是否分析标准库函数调用，默认False
+            max_workers: 并行解析文件的进程数，默认1表示在当前进程中串行处理，None表示使用CPU核数
+            use_disk_cache: 是否把解析得到的AST（按源码哈希）和按文件的分析结果缓存到输出目录
+                （相对当前工作目录的 analysis_results/），供下次运行复用，默认关闭。
+                缓存用 pickle 读写，只应在可信的工作目录中开启
+            skipped_dirs: 查找Java文件时跳过的 src_root 直接子目录名，默认跳过版本控制、IDE和构建输出目录
         """
         self.ast_data = {}
         self.src_root = None  # 源代码根目录
         self.method_index = {}  # 存储所有方法的索引
         self.call_graph = CallGraph()
         self.analyze_stdlib = analyze_stdlib  # 新增参数
+        self.skipped_dirs = frozenset(skipped_dirs)
+        self.max_workers = max_workers or os.cpu_count() or 1
         # 创建输出目录
         self.output_dir = "analysis_results"
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
+        self.use_disk_cache = use_disk_cache
+        self._disk_cache_dir = os.path.join(self.output_dir, '.ast_cache')
+        self._disk_cache_index = None  # 源文件完整路径 -> (修改时间, 文件大小, 源码哈希)，首次使用时加载
+        self._disk_cache_dirty = False
             
         self.logger = logger or self._setup_logger()
-        self.ast_cache = {}  # 缓存已解析的AST
+        self.ast_cache = {}  # 缓存已解析的AST：相对路径 -> (修改时间, 语法树)
+        self.file_records = {}  # 缓存第一遍得到的文件信息：(当前类型, 字段类型)
+        self._parent_map = {}  # 方法声明节点 id -> 父节点，父节点引用着方法节点，id 不会被复用
+        self._end_line_map = {}  # 方法/构造函数节点 -> 结束行号，由 _process_file 一次遍历算出
+        self._full_paths = {}  # 相对路径 -> 源文件完整路径
+        self._type_name_cache = {}  # 类型节点 id -> (节点, 类型名)，处理每个文件时清空
+        self._signature_cache = {}  # 方法节点 id -> (节点, 方法签名)
+        self._files_without_calls = set()  # 源码中找不到调用形式文本的文件
+        self._file_types = {}  # 文件路径 -> 该文件第一个登记到 method_index 的类型名
+        self._current_class_cache = {}  # 文件路径 -> (语法树, 主类名)
+        self._field_types_cache = {}  # 文件路径 -> (语法树, 字段类型)，没有第一遍记录时使用
+        self._method_ranges_cache = {}  # 文件路径 -> (语法树, 源码行列表, 主类名, 方法行号映射, 方法行号范围)
+        self._source_lines_cache = {}  # 相对路径 -> (修改时间, 源码行列表)
+        # 逐个文件分析时按加入顺序记录的索引条目（包括被同名条目覆盖的），
+        # 主进程合并时据此按全局索引重新确定重载方法的名称；为None时不记录
+        self._index_entries = None
         self.class_cache = {}  # 缓存类名解析结果
         self.import_cache = {}  # 缓存导入语句解析结果
         self.field_types = {}  # 缓存字段类型
@@ -69,18 +757,37 @@ class JavaASTExtractor:
         java_files = self._get_java_files()
         self.logger.info(f"找到 {len(java_files)} 个Java文件")
         
-        # 使用集合来跟踪已处理的文件
-        processed_files = set()
+        if self.use_disk_cache:
+            self._analyze_files_snapshot(java_files)
+            self._prune_disk_cache(java_files)
+        elif self.max_workers > 1 and len(java_files) > 1:
+            self._analyze_files_parallel(java_files)
+        else:
+            self._analyze_files_serial(java_files)
         
+        self.logger.info(f"调用图构建完成，共有 {len(self.call_graph.edges)} 个方法的调用关系")
+        self._save_disk_cache_index()
+        
+        # 保存调用图
+        output_file = os.path.join(self.output_dir, 'call_graph.json')
+        self.call_graph.save(output_file)
+        self.logger.info(f"调用关系图已保存到: {output_file}")
+
+    def _analyze_files_serial(self, java_files):
+        """在当前进程中依次建立方法索引并分析方法调用
+
+        第一遍解析得到的AST和文件信息会被缓存，第二遍直接复用，不再重新读取文件。
+
+        Args:
+            java_files: 需要分析的文件列表
+        """
         # 第一遍：建立方法索引
+        processed_files = []
         for file_path in java_files:
-            if file_path in processed_files or 'package-info.java' in file_path:
-                continue
-            
             try:
-                self.logger.debug(f"\n处理文件: {file_path}")
+                self.logger.debug("\n处理文件: %s", file_path)
                 self._process_file(file_path)
-                processed_files.add(file_path)
+                processed_files.append(file_path)
             except Exception as e:
                 self.logger.error(f"处理文件时出错 {file_path}: {str(e)}")
         
@@ -92,18 +799,212 @@ class JavaASTExtractor:
                 self._process_file_calls(file_path)
             except Exception as e:
                 self.logger.error(f"处理方法调用时出错 {file_path}: {str(e)}")
+
+    def _analyze_files_parallel(self, java_files):
+        """使用进程池并行分析文件，并在主进程中合并结果
+
+        每个文件在子进程中只解析一次。主进程先合并所有文件的方法索引，
+        再合并调用关系，与串行处理时两遍分析的顺序保持一致。
+
+        Args:
+            java_files: 需要分析的文件列表
+        """
+        self._merge_file_results(self._map_file_results(java_files))
+
+    def _analyze_files_snapshot(self, java_files):
+        """按源码哈希复用上次运行保存的分析结果，只分析内容有变化的文件
+
+        每个文件的分析结果与并行处理时子进程返回的结果相同，合并方式也相同；
+        内容未变化的文件直接取快照中的结果，既不解析也不重新分析。
+
+        Args:
+            java_files: 需要分析的文件列表
+        """
+        snapshot = self._load_index_snapshot()
+        new_snapshot = {}
+        digests = {}
+        changed_files = []
+        for file_path in java_files:
+            normalized_path = os.path.normpath(file_path)
+            try:
+                full_path = self._full_path(normalized_path)
+                digest = self._file_digest(full_path, os.stat(full_path))[0]
+            except OSError:
+                digest = None
+            entry = snapshot.get(normalized_path)
+            if digest is not None and entry is not None and entry[0] == digest:
+                new_snapshot[normalized_path] = entry
+            else:
+                digests[normalized_path] = digest
+                changed_files.append(file_path)
+        self.logger.info("%s 个文件内容未变化，复用上次的分析结果", len(java_files) - len(changed_files))
+        # 子进程从磁盘读取AST缓存索引，先写回刚计算的哈希
+        self._save_disk_cache_index()
+
+        computed = {}
+        for result in self._map_file_results(changed_files):
+            file_path, index_result, call_result, error = result
+            computed[file_path] = result
+            digest = digests[os.path.normpath(file_path)]
+            if error is None and digest is not None:
+                new_snapshot[os.path.normpath(file_path)] = (digest, index_result, call_result)
+
+        def ordered_results():
+            # 按原文件顺序合并，结果与全部重新分析时一致
+            for file_path in java_files:
+                result = computed.get(file_path)
+                if result is None:
+                    entry = new_snapshot[os.path.normpath(file_path)]
+                    result = (file_path, entry[1], entry[2], None)
+                yield result
+
+        self._merge_file_results(ordered_results())
+        if changed_files or len(new_snapshot) != len(snapshot):
+            self._save_index_snapshot(new_snapshot)
+
+    def _map_file_results(self, java_files):
+        """逐个文件分析，按 java_files 的顺序产出 (文件路径, 索引结果, 调用分析结果, 错误信息)
+
+        max_workers 大于1时使用进程池，否则在当前进程中用一个独立的分析器实例处理。
+
+        Args:
+            java_files: 需要分析的文件列表
+        """
+        if self.max_workers > 1 and len(java_files) > 1:
+            chunksize = min(32, max(1, len(java_files) // (self.max_workers * 4)))
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(self.src_root, self.logger.name, self.use_disk_cache)) as executor:
+                for result, cache_entry in executor.map(_analyze_file_worker, java_files, chunksize=chunksize):
+                    if cache_entry is not None:
+                        # 合并子进程计算的源码哈希，下次运行不必重新读取和计算
+                        index = self._get_disk_cache_index()
+                        full_path = self._full_path(os.path.normpath(result[0]))
+                        if index.get(full_path) != cache_entry:
+                            index[full_path] = cache_entry
+                            self._disk_cache_dirty = True
+                    yield result
+            return
+
+        extractor = JavaASTExtractor(self.logger, max_workers=1, use_disk_cache=self.use_disk_cache)
+        extractor.src_root = self.src_root
+        if self.use_disk_cache:
+            # 与当前实例共用AST缓存索引，同一文件不必重复计算哈希
+            extractor._disk_cache_index = self._get_disk_cache_index()
+        for file_path in java_files:
+            yield _analyze_file_isolated(extractor, file_path)
+        self._disk_cache_dirty = self._disk_cache_dirty or extractor._disk_cache_dirty
+
+    def _merge_file_results(self, results):
+        """合并逐个文件的分析结果
+
+        先合并所有文件的方法索引，再合并调用关系，与串行处理时两遍分析的顺序保持一致。
+
+        Args:
+            results: (文件路径, 索引结果, 调用分析结果, 错误信息) 的可迭代对象
+        """
+        call_results = []
+        # 第一遍结果：陆续返回时即合并方法索引，调用关系留到索引完整后再合并
+        for file_path, index_result, call_result, error in results:
+            if error is not None:
+                self.logger.error(f"处理文件时出错 {file_path}: {error}")
+                continue
+            self._merge_index_result(index_result)
+            call_results.append(call_result)
         
-        self.logger.info(f"调用图构建完成，共有 {len(self.call_graph.edges)} 个方法的调用关系")
+        self.logger.info(f"索引了 {len(self.method_index)} 个方法")
         
-        # 保存调用图
-        output_file = os.path.join(self.output_dir, 'call_graph.json')
-        self.call_graph.save(output_file)
-        self.logger.info(f"调用关系图已保存到: {output_file}")
+        # 第二遍结果：合并调用关系
+        for new_methods, calls, class_cache in call_results:
+            new_methods = [(caller_method, method_info) for caller_method, method_info in new_methods
+                           if caller_method not in self.method_index]
+            self.method_index.update(new_methods)
+            self.call_graph.add_methods(new_methods)
+            self.call_graph.add_calls(_intern_calls(calls))
+            self.class_cache.update(class_cache)
+
+    def _index_snapshot_file(self):
+        """按文件分析结果快照的路径"""
+        return os.path.join(self.output_dir, 'index_snapshot.pkl')
+
+    def _load_index_snapshot(self):
+        """
+        读取上次 build_project_index 保存的按文件分析结果。
+
+        Returns:
+            dict: 相对路径 -> (源码哈希, 索引结果, 调用分析结果)；源代码根目录与本次不同时为空
+        """
+        snapshot_file = self._index_snapshot_file()
+        if not os.path.exists(snapshot_file):
+            return {}
+        try:
+            with open(snapshot_file, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            self.logger.warning(f"读取分析结果快照失败，将重新分析: {str(e)}")
+            return {}
+        # 格式版本不同（如旧版本保存的快照）时整体重新分析
+        if len(snapshot) != 3 or snapshot[0] != _INDEX_SNAPSHOT_VERSION:
+            return {}
+        _, cached_root, entries = snapshot
+        if cached_root != os.path.abspath(self.src_root):
+            return {}
+        return entries
+
+    def _save_index_snapshot(self, entries):
+        """保存按文件分析结果快照，供下次 build_project_index 复用"""
+        self._write_pickle(self._index_snapshot_file(),
+                           (_INDEX_SNAPSHOT_VERSION, os.path.abspath(self.src_root), entries))
+
+    def _merge_index_result(self, index_result):
+        """把子进程中单个文件的索引结果合并到主进程
+
+        单个文件的方法名是在只有本文件的索引中确定的，这里按条目加入的顺序，
+        用与 _add_method_to_index 相同的重载规则对照全局索引重新确定名称，
+        不同文件中同名类的同名方法不会互相覆盖，结果与串行建立索引时一致。
+
+        Args:
+            index_result: (按加入顺序排列的索引条目, 导入缓存, 方法局部变量)
+        """
+        index_entries, import_cache, local_vars = index_result
+        method_index = self.method_index
+        methods = []
+        for info in index_entries:
+            # 类型条目只存在于索引中，不属于调用图节点
+            if info.get('type') == 'class':
+                qualified_name = sys.intern(f"{info['package']}.{info['name']}")
+                method_index[qualified_name] = info
+                self._file_types.setdefault(info['file_path'], qualified_name)
+                continue
+            # 经过 pickle 的方法名不再是驻留字符串，这里得到的名称都已重新驻留
+            qualified_name = _index_method_name(
+                method_index, f"{info['class_name']}.{info['name']}",
+                lambda: [_strip_varargs(param['type']) for param in info['parameters']])
+            if qualified_name != info['qualified_name']:
+                # 条目可能还保存在快照中，改名时复制一份
+                info = MethodInfo(**info._to_dict())
+                info.qualified_name = qualified_name
+            method_index[qualified_name] = info
+            methods.append((qualified_name, info))
+        self.call_graph.add_methods(methods)
+        self.import_cache.update(import_cache)
+        self.method_local_vars.update(local_vars)
 
     def _clear_caches(self):
         """清空所有缓存和索引"""
         self.method_index = {}
         self.ast_cache = {}
+        self.file_records = {}
+        self._parent_map = {}
+        self._end_line_map = {}
+        self._full_paths = {}
+        self._type_name_cache = {}
+        self._signature_cache = {}
+        self._files_without_calls = set()
+        self._file_types = {}
+        self._current_class_cache = {}
+        self._field_types_cache = {}
+        self._method_ranges_cache = {}
+        self._source_lines_cache = {}
         self.class_cache = {}
         self.import_cache = {}
         self.call_graph = CallGraph()
@@ -114,66 +1015,322 @@ class JavaASTExtractor:
 
     def _get_java_files(self):
         """获取所有Java文件的相对路径"""
-        java_files = []
-        for root, _, files in os.walk(self.src_root):
-            for file in files:
-                if file.endswith('.java'):
-                    # 使用相对路径，并统一使用正斜杠
-                    rel_path = os.path.relpath(os.path.join(root, file), self.src_root)
-                    rel_path = rel_path.replace('\\', '/')
-                    java_files.append(rel_path)
-        return java_files
+        return list(self._iter_java_files())
+
+    def _iter_java_files(self):
+        """使用 os.scandir 遍历源代码目录，逐个产出Java文件的相对路径
+
+        DirEntry 自带文件类型信息，避免了 os.walk 对每个条目的额外 stat 调用。
+        src_root 下直接的 skipped_dirs 目录不会进入（更深层的同名目录照常遍历，
+        它们可能是Java包）；package-info.java、module-info.java 以及
+        （未开启 analyze_stdlib 时）标准库包下的文件在这里直接跳过，不会被读取和解析。
+        标准库文件只在路径中能找到 main/java/、test/java/ 源码目录时才能识别。
+        """
+        skipped_dirs = self.skipped_dirs
+        # 每个目录带上相对 src_root 的路径前缀（使用正斜杠），文件的相对路径直接拼接得到
+        pending_dirs = [(self.src_root, '')]
+        while pending_dirs:
+            current_dir, prefix = pending_dirs.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if prefix or entry.name not in skipped_dirs:
+                                pending_dirs.append((entry.path, f"{prefix}{entry.name}/"))
+                        elif entry.name.endswith('.java'):
+                            # package-info/module-info 中没有方法，不必读取和解析
+                            if entry.name in _SKIPPED_JAVA_FILES:
+                                continue
+                            # 使用相对路径，并统一使用正斜杠
+                            rel_path = prefix + entry.name
+                            if not self.analyze_stdlib:
+                                package_path = _guess_package_path(rel_path)
+                                if package_path is not None and package_path.startswith(EXCLUDE_PREFIXES):
+                                    self.logger.debug("跳过标准库文件: %s", rel_path)
+                                    continue
+                            yield rel_path
+            except OSError as e:
+                self.logger.warning(f"无法读取目录 {current_dir}: {str(e)}")
+
+    def _full_path(self, file_path):
+        """获取源文件的完整路径，结果按相对路径缓存
+
+        Args:
+            file_path: 相对于 src_root 的文件路径
+
+        Returns:
+            str: 源文件完整路径
+        """
+        full_path = self._full_paths.get(file_path)
+        if full_path is None:
+            full_path = self._full_paths[file_path] = os.path.join(self.src_root, file_path)
+        return full_path
+
+    def _get_tree(self, normalized_path):
+        """获取文件的AST，命中缓存且文件未修改时不再重复读取和解析
+
+        建立索引的两遍分析、查找受影响方法和获取当前类型都通过这里取得语法树，
+        每个文件只解析一次。缓存按文件修改时间校验，文件改动后重新解析。
+
+        Args:
+            normalized_path: 经过 os.path.normpath 处理的相对路径
+
+        Returns:
+            CompilationUnit: javalang 解析得到的语法树
+        """
+        full_path = self._full_path(normalized_path)
+        stat = os.stat(full_path)
+        mtime = stat.st_mtime
+        cached = self.ast_cache.get(normalized_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        tree, has_calls = self._load_parsed(normalized_path, full_path, stat)
+        self.ast_cache[normalized_path] = (mtime, tree)
+        # 源码中没有任何调用形式的文本时，第二遍分析可以直接跳过
+        if has_calls:
+            self._files_without_calls.discard(normalized_path)
+        else:
+            self._files_without_calls.add(normalized_path)
+        return tree
+
+    def _get_source_lines(self, normalized_path):
+        """获取源文件的行列表，按文件修改时间缓存
+
+        Args:
+            normalized_path: 经过 os.path.normpath 处理的相对路径
+
+        Returns:
+            list: 源码行列表（保留行尾换行符）
+        """
+        full_path = self._full_path(normalized_path)
+        mtime = os.stat(full_path).st_mtime
+        cached = self._source_lines_cache.get(normalized_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        # 与文本模式 readlines 一致：统一换行符并保留行尾
+        source = _decode_source(_read_source_bytes(full_path))
+        source_lines = io.StringIO(source, newline=None).readlines()
+        self._source_lines_cache[normalized_path] = (mtime, source_lines)
+        return source_lines
+
+    def _load_parsed(self, normalized_path, full_path, stat):
+        """读取并解析源文件，优先从磁盘缓存加载
+
+        修改时间和文件大小与缓存索引一致时不读取源码，直接按记录的哈希加载；
+        否则读取源码计算哈希，内容未变（如仅修改时间变化）时仍可命中缓存。
+
+        Args:
+            normalized_path: 经过 os.path.normpath 处理的相对路径
+            full_path: 源文件完整路径
+            stat: 源文件的 os.stat 结果
+
+        Returns:
+            tuple: (语法树, 源码中是否有调用形式的文本)
+        """
+        if not self.use_disk_cache:
+            return self._parse_source(normalized_path, _decode_source(_read_source_bytes(full_path)))
+
+        digest, data = self._file_digest(full_path, stat)
+        parsed = self._read_disk_cache(digest)
+        if parsed is None:
+            if data is None:
+                data = _read_source_bytes(full_path)
+            parsed = self._parse_source(normalized_path, _decode_source(data))
+            self._write_disk_cache(digest, parsed)
+        return parsed
+
+    def _file_digest(self, full_path, stat):
+        """获取源文件内容的哈希，修改时间和文件大小与缓存索引一致时不读取源码
+
+        Args:
+            full_path: 源文件完整路径
+            stat: 源文件的 os.stat 结果
+
+        Returns:
+            tuple: (源码哈希, 读出的原始字节；未读取文件时为None)
+        """
+        index = self._get_disk_cache_index()
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        entry = index.get(full_path)
+        if entry is not None and entry[:2] == file_key:
+            return entry[2], None
+
+        # 按原始字节计算哈希，命中缓存时不必解码
+        data = _read_source_bytes(full_path)
+        digest = _source_digest(data)
+        index[full_path] = file_key + (digest,)
+        self._disk_cache_dirty = True
+        return digest, data
+
+    def _parse_source(self, normalized_path, source):
+        """使用 javalang 解析源码
+
+        Returns:
+            tuple: (语法树, 源码中是否有调用形式的文本)
+        """
+        has_calls = _CALL_RE.search(source) is not None
+        # 源码中连声明类型的关键字都没有时不可能有类型声明，不必完整解析
+        if not any(keyword in source for keyword in _TYPE_KEYWORDS):
+            self.logger.debug("文件中没有类型声明，跳过语法分析: %s", normalized_path)
+            return _empty_compilation_unit(scan_header(source)), has_calls
+        try:
+            tree = javalang.parse.parse(source)
+        except (javalang.parser.JavaSyntaxError, javalang.tokenizer.LexerError):
+            # javalang 不支持的语法：用词法扫描确认文件中没有类型声明时，
+            # 直接以空的编译单元代替，不必把整个文件当作出错处理
+            header = scan_header(source)
+            if header.types:
+                raise
+            self.logger.debug("文件中没有类型声明，跳过语法分析: %s", normalized_path)
+            tree = _empty_compilation_unit(header)
+        return tree, has_calls
+
+    def _get_disk_cache_index(self):
+        """加载AST磁盘缓存的索引，只在第一次使用时读取"""
+        if self._disk_cache_index is None:
+            self._disk_cache_index = {}
+            index_file = os.path.join(self._disk_cache_dir, 'index.pkl')
+            if os.path.exists(index_file):
+                try:
+                    with open(index_file, 'rb') as f:
+                        self._disk_cache_index = pickle.load(f)
+                except Exception as e:
+                    self.logger.warning(f"读取AST缓存索引失败: {str(e)}")
+        return self._disk_cache_index
+
+    def _save_disk_cache_index(self):
+        """索引有变化时写回磁盘"""
+        if not self._disk_cache_dirty:
+            return
+        self._write_pickle(os.path.join(self._disk_cache_dir, 'index.pkl'), self._disk_cache_index)
+        self._disk_cache_dirty = False
+
+    def _read_disk_cache(self, digest):
+        """按源码哈希读取缓存的解析结果，不存在或读取失败时返回None"""
+        cache_file = os.path.join(self._disk_cache_dir, f"{digest}.pkl")
+        if not os.path.exists(cache_file):
+            return None
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            self.logger.warning(f"读取AST缓存失败 {cache_file}: {str(e)}")
+            return None
+
+    def _prune_disk_cache(self, java_files):
+        """清理AST磁盘缓存中不再被引用的解析结果
+
+        src_root 下已不存在的文件先从索引中移除，然后删除索引中没有任何文件引用的缓存文件，
+        避免文件修改或删除后旧的解析结果一直留在磁盘上。
+
+        Args:
+            java_files: 本次分析的文件列表，它们的源码哈希此时都已记录在索引中
+        """
+        index = self._get_disk_cache_index()
+        root_prefix = os.path.join(self.src_root, '')
+        current = {self._full_path(os.path.normpath(f)) for f in java_files}
+        stale = [path for path in index if path.startswith(root_prefix) and path not in current]
+        for path in stale:
+            del index[path]
+        if stale:
+            self._disk_cache_dirty = True
+
+        referenced = {entry[2] for entry in index.values()}
+        try:
+            names = os.listdir(self._disk_cache_dir)
+        except OSError:
+            return
+        removed = 0
+        for name in names:
+            digest, ext = os.path.splitext(name)
+            if ext != '.pkl' or name == 'index.pkl' or digest in referenced:
+                continue
+            try:
+                os.remove(os.path.join(self._disk_cache_dir, name))
+                removed += 1
+            except OSError as e:
+                self.logger.warning(f"删除AST缓存失败 {name}: {str(e)}")
+        if removed:
+            self.logger.info("清理了 %s 个不再使用的AST缓存", removed)
+
+    def _write_disk_cache(self, digest, parsed):
+        """按源码哈希保存解析结果"""
+        self._write_pickle(os.path.join(self._disk_cache_dir, f"{digest}.pkl"), parsed)
+
+    def _write_pickle(self, path, obj):
+        """先写临时文件再替换，避免并行进程读到写了一半的缓存"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self._disk_cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"写入AST缓存失败 {path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
     def _process_file(self, file_path):
         try:
             normalized_path = os.path.normpath(file_path)
-            full_path = os.path.join(self.src_root, normalized_path)
             
-            # 读取并解析文件
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            tree = javalang.parse.parse(content)
+            # 读取并解析文件（结果会缓存，供第二遍分析调用时复用）
+            tree = self._get_tree(normalized_path)
+            # 类型名缓存只在同一文件内命中，换文件时清空，避免随项目规模无限增长
+            self._type_name_cache.clear()
+            
+            # 只遍历一次AST，按类型收集后续各步骤需要的节点；
+            # 包声明和导入只会出现在 CompilationUnit 上，直接读取即可
+            field_nodes = []
+            method_nodes = []
+            class_nodes = []
+            # 该循环对每个AST节点执行一次，属性查找和绑定方法都提前放到局部变量中
+            parent_map = self._parent_map
+            end_line_tracker = _EndLineTracker()
+            visit = end_line_tracker.visit
+            MethodDeclaration = javalang.tree.MethodDeclaration
+            FieldDeclaration = javalang.tree.FieldDeclaration
+            ClassDeclaration = javalang.tree.ClassDeclaration
+            for path, node in _walk_tree(tree):
+                visit(len(path), node)
+                if isinstance(node, MethodDeclaration):
+                    method_nodes.append((path, node))
+                    if path:
+                        parent_map[id(node)] = path[-1]
+                elif isinstance(node, FieldDeclaration):
+                    field_nodes.append(node)
+                elif isinstance(node, ClassDeclaration):
+                    class_nodes.append(node)
+            self._end_line_map.update(end_line_tracker.finish())
             
             # 获取包名和导入信息
-            package_name = None
             imports = {}
-            
-            # 处理包声明
-            for _, node in tree.filter(javalang.tree.PackageDeclaration):
-                if isinstance(node.name, list):
-                    package_name = '.'.join(str(n.value) for n in node.name if hasattr(n, 'value'))
-                else:
-                    package_name = str(node.name)
-                self.logger.debug(f"包名: {package_name}")
-                break
+            package_name = self._get_package_name(tree)
+            self.logger.debug("包名: %s", package_name)
             
             # 修改导入处理逻辑
-            # 1. 处理显式导入
-            for _, node in tree.filter(javalang.tree.Import):
-                if node.path:
-                    if isinstance(node.path, list):
-                        import_path = '.'.join(str(p.value) if hasattr(p, 'value') else str(p) for p in node.path)
-                    else:
-                        import_path = str(node.path)
-                    
-                    # 处理静态导入和普通导入
-                    if node.static:
-                        # 静态导入
-                        class_name = '.'.join(import_path.split('.')[:-1])
-                        method_name = import_path.split('.')[-1]
-                        imports[method_name] = {'type': 'static', 'class': class_name, 'member': method_name}
+            # 1. 处理显式导入（导入路径只转换一次，后面再次处理导入时复用）
+            import_entries = [(node, _path_to_str(node.path)) for node in tree.imports or () if node.path]
+            for node, import_path in import_entries:
+                # 处理静态导入和普通导入
+                if node.static:
+                    # 静态导入
+                    class_name = '.'.join(import_path.split('.')[:-1])
+                    method_name = import_path.split('.')[-1]
+                    imports[method_name] = {'type': 'static', 'class': class_name, 'member': method_name}
+                else:
+                    # 普通导入
+                    if '*' in import_path:
+                        # 导入整个包
+                        package = import_path.replace('.*', '')
+                        imports[package] = {'type': 'package', 'package': package}
                     else:
-                        # 普通导入
-                        if '*' in import_path:
-                            # 导入整个包
-                            package = import_path.replace('.*', '')
-                            imports[package] = {'type': 'package', 'package': package}
-                        else:
-                            # 导入具体类
-                            simple_name = import_path.split('.')[-1]
-                            imports[simple_name] = {'type': 'class', 'fqn': import_path}
-                            # 同时保存字符串形式，用于向后兼容
-                            imports[simple_name] = import_path
+                        # 导入具体类
+                        simple_name = import_path.split('.')[-1]
+                        imports[simple_name] = {'type': 'class', 'fqn': import_path}
+                        # 同时保存字符串形式，用于向后兼容
+                        imports[simple_name] = import_path
 
             # 2. 添加隐式导入
             imports['java.lang'] = {'type': 'package', 'package': 'java.lang'}
@@ -183,8 +1340,9 @@ class JavaASTExtractor:
             self.import_cache[normalized_path] = imports
             
             # 获取所有字段的类型信息
+            debug = self.logger.isEnabledFor(logging.DEBUG)
             field_types = {}
-            for path, field_decl in tree.filter(javalang.tree.FieldDeclaration):
+            for field_decl in field_nodes:
                 # 获取字段类型
                 field_type = self._resolve_type_name(field_decl.type, imports, package_name)
                 
@@ -192,7 +1350,8 @@ class JavaASTExtractor:
                 for declarator in field_decl.declarators:
                     field_name = declarator.name
                     field_types[field_name] = field_type
-                    self.logger.debug(f"添加字段类型: {field_name} -> {field_type}")
+                    if debug:
+                        self.logger.debug("添加字段类型: %s -> %s", field_name, field_type)
                     
                     # 如果有初始化器，也处理它
                     if declarator.initializer:
@@ -203,31 +1362,27 @@ class JavaASTExtractor:
                                 creator_type = class_ref.type.name
                                 resolved_type = self._resolve_type_name(creator_type, imports, package_name)
                                 field_types[field_name] = resolved_type
-                                self.logger.debug(f"从工厂方法推断字段类型: {field_name} -> {resolved_type}")
+                                self.logger.debug("从工厂方法推断字段类型: %s -> %s", field_name, resolved_type)
             
             # 在处理方法声明之前，先处理所有导入
-            for _, node in tree.filter(javalang.tree.Import):
-                if node.path:
-                    if isinstance(node.path, list):
-                        import_path = '.'.join(str(p.value) if hasattr(p, 'value') else str(p) for p in node.path)
-                    else:
-                        import_path = str(node.path)
-                    simple_name = import_path.split('.')[-1]
-                    imports[simple_name] = import_path
+            for _, import_path in import_entries:
+                simple_name = import_path.split('.')[-1]
+                imports[simple_name] = import_path
             
             # 在处理方法声明之前添加局部变量类型分析
-            for path, method_decl in tree.filter(javalang.tree.MethodDeclaration):
+            for path, method_decl in method_nodes:
                 # 获取完整的方法名
                 parent_class = self._find_parent_class(path)
                 if not parent_class:
-                    self.logger.warning(f"找不到方法 {method_decl.name} 的父类，跳过处理")
+                    self.logger.warning("找不到方法 %s 的父类，跳过处理", method_decl.name)
                     continue
                 
-                # 构建完整的方法名
-                current_type = f"{package_name}.{parent_class.name}"
-                method_name = f"{current_type}.{method_decl.name}"
+                # 构建完整的方法名（驻留字符串，相同名称在各个索引中共享同一对象）
+                current_type = sys.intern(f"{package_name}.{parent_class.name}")
+                method_name = sys.intern(f"{current_type}.{method_decl.name}")
                 
-                self.logger.debug(f"\n=== 处理方法: {method_name} ===")
+                if debug:
+                    self.logger.debug("\n=== 处理方法: %s ===", method_name)
                 
                 # 初始化方法的局部变量映射
                 method_vars = {}
@@ -237,7 +1392,8 @@ class JavaASTExtractor:
                     for param in method_decl.parameters:
                         param_type = self._resolve_type_name(param.type, imports, package_name)
                         method_vars[param.name] = param_type
-                        self.logger.debug(f"添加方法参数: {param.name} -> {param_type}")
+                        if debug:
+                            self.logger.debug("添加方法参数: %s -> %s", param.name, param_type)
                 
                 # 处理方法体中的局部变量
                 if method_decl.body:
@@ -246,23 +1402,27 @@ class JavaASTExtractor:
                 
                 # 存储方法的局部变量信息
                 self.method_local_vars[method_name] = method_vars
-                self.logger.debug(f"存储方法局部变量: {method_name} -> {method_vars}")
+                if debug:
+                    self.logger.debug("存储方法局部变量: %s -> %s", method_name, method_vars)
 
             # 处理所有类型声明
-            for path, type_decl in tree.filter(javalang.tree.ClassDeclaration):
+            for type_decl in class_nodes:
                 type_name = type_decl.name
-                qualified_name = f"{package_name}.{type_name}"
+                qualified_name = sys.intern(f"{package_name}.{type_name}")
                 
                 # 添加类型信息到索引
-                type_info = {
-                    'file_path': normalized_path,
-                    'package': package_name,
-                    'name': type_name,
-                    'type': 'class',
-                    'methods': {},
-                    'imports': imports
-                }
+                type_info = TypeInfo(
+                    file_path=normalized_path,
+                    package=package_name,
+                    name=type_name,
+                    type='class',
+                    methods={},
+                    imports=imports
+                )
                 self.method_index[qualified_name] = type_info
+                if self._index_entries is not None:
+                    self._index_entries.append(type_info)
+                self._file_types.setdefault(normalized_path, qualified_name)
                 
                 # 处理构造函数
                 for constructor in type_decl.constructors:
@@ -278,7 +1438,12 @@ class JavaASTExtractor:
                     
                     self._add_method_to_index(method, qualified_name, file_path, method_type)
 
-            self.logger.info(f"索引了 {len(self.method_index)} 个方法")
+            # 记录类型的继承信息，以及第二遍分析方法调用所需的文件信息，避免重新解析
+            self._index_types(file_path, tree)
+            current_type = self._get_current_class(file_path, tree)
+            self.file_records[normalized_path] = (current_type, field_types)
+
+            self.logger.info("索引了 %s 个方法", len(self.method_index))
 
         except Exception as e:
             self.logger.error(f"处理文件时出错 {file_path}: {str(e)}")
@@ -289,7 +1454,7 @@ class JavaASTExtractor:
     def _process_statement(self, statement, method_vars, imports, package_name):
         """处理语句中的局部变量声明和初始化"""
         if isinstance(statement, javalang.tree.LocalVariableDeclaration):
-            self.logger.debug(f"\n处理变量声明: {statement}")
+            self.logger.debug("\n处理变量声明: %s", statement)
             
             # 获取变量类型
             var_type = self._resolve_type_name(statement.type, imports, package_name)
@@ -301,7 +1466,7 @@ class JavaASTExtractor:
                         creator_type = declarator.initializer.type.name
                         resolved_type = self._resolve_type_name(creator_type, imports, package_name)
                         method_vars[declarator.name] = resolved_type
-                        self.logger.debug(f"从对象创建推断类型: {declarator.name} -> {resolved_type}")
+                        self.logger.debug("从对象创建推断类型: %s -> %s", declarator.name, resolved_type)
                     elif isinstance(declarator.initializer, javalang.tree.MethodInvocation):
                         # 处理工厂方法
                         if (declarator.initializer.arguments and 
@@ -310,44 +1475,62 @@ class JavaASTExtractor:
                             creator_type = class_ref.type.name
                             resolved_type = self._resolve_type_name(creator_type, imports, package_name)
                             method_vars[declarator.name] = resolved_type
-                            self.logger.debug(f"从工厂方法推断类型: {declarator.name} -> {resolved_type}")
+                            self.logger.debug("从工厂方法推断类型: %s -> %s", declarator.name, resolved_type)
                         else:
                             method_vars[declarator.name] = var_type
-                            self.logger.debug(f"使用声明类型: {declarator.name} -> {var_type}")
+                            self.logger.debug("使用声明类型: %s -> %s", declarator.name, var_type)
                 else:
                     method_vars[declarator.name] = var_type
-                    self.logger.debug(f"添加局部变量: {declarator.name} -> {var_type}")
+                    self.logger.debug("添加局部变量: %s -> %s", declarator.name, var_type)
         
         # 递归处理语句块
         if isinstance(statement, javalang.tree.BlockStatement):
-            if hasattr(statement, 'statements') and statement.statements:
+            if statement.statements:
                 for stmt in statement.statements:
                     self._process_statement(stmt, method_vars, imports, package_name)
 
+    def _method_end_line(self, node, source_lines, ast_end_line=None):
+        """获取方法/构造函数的结束行号
+
+        建立索引（method_index 中的 end_line 和源代码）和查找受影响的方法都通过这里取得结束行，
+        两处的方法范围保持一致：优先按花括号配对得到方法体右花括号所在的行，
+        没有方法体或无法配对时使用语法树中最后的位置。
+
+        Args:
+            node: 方法或构造函数声明节点
+            source_lines: 源文件的行列表，没有时只使用语法树中的位置
+            ast_end_line: 可选，已经算出的语法树结束行号
+
+        Returns:
+            int: 结束行号，无法确定时返回None
+        """
+        start_line = node.position.line if node.position else None
+        end_line = None
+        if start_line and source_lines is not None:
+            end_line = _end_line_by_braces(source_lines, start_line)
+        return end_line or ast_end_line or self._find_node_end_line(node)
+
     def _find_node_end_line(self, node):
         """查找节点的结束行号，包括结束大括号"""
         try:
-            if not hasattr(node, 'position') or not node.position:
+            end_line = self._end_line_map.get(node)
+            if end_line is not None:
+                return end_line
+
+            # 所有 javalang 节点都有 position 属性，没有位置信息时为 None
+            position = node.position
+            if not position:
                 return None
             
-            # 获取起始行号
-            start_line = node.position.line
-            
-            # 遍历所有子节点，找到最大的行号
-            max_line = start_line
-            
-            # 使用filter遍历所有子节点
-            for _, child in node.filter(object):
-                if hasattr(child, 'position') and child.position:
-                    max_line = max(max_line, child.position.line)
-                    
-                # 如果子节点有token_end_pos属性，也考虑它
-                if hasattr(child, 'token_end_pos') and child.token_end_pos:
-                    max_line = max(max_line, child.token_end_pos[0])
-            
-            # 如果节点有token_end_pos属性，也考虑它
-            if hasattr(node, 'token_end_pos') and node.token_end_pos:
-                max_line = max(max_line, node.token_end_pos[0])
+            # 子节点按源码顺序排列，最大行号一定出现在最后一条语句/成员中，
+            # 只需遍历它的子树；最后一项没有任何位置信息时再遍历整个节点
+            body = getattr(node, 'body', None)
+            max_line = _max_position_line(body[-1], 0) if isinstance(body, list) and body else 0
+            if max_line:
+                max_line = max(max_line, position.line)
+            else:
+                # 迭代遍历所有子节点，取最大的行号（javalang 不记录节点的结束位置）
+                max_line = _max_position_line(node, position.line)
             
             return max_line+1
             
@@ -356,20 +1539,32 @@ class JavaASTExtractor:
             return None
 
     def _get_type_name(self, type_node):
-        """获取类型的完整名称"""
+        """获取类型的完整名称
+
+        结果按节点缓存（以 id 为键，同时保存节点本身防止 id 被复用），
+        同一个类型节点在签名、参数列表和重载名中只计算一次。类型名会被驻留，
+        各方法的参数和返回类型中反复出现的 String、int 等共享同一个字符串对象。
+        """
         if type_node is None:
             return 'void'
         
-        if isinstance(type_node, javalang.tree.BasicType):
-            return type_node.name
+        cached = self._type_name_cache.get(id(type_node))
+        if cached is not None and cached[0] is type_node:
+            return cached[1]
         
-        if isinstance(type_node, javalang.tree.ReferenceType):
+        if isinstance(type_node, javalang.tree.BasicType):
+            type_name = type_node.name
+        elif isinstance(type_node, javalang.tree.ReferenceType):
             # 处理数组类型
             array_depth = len(type_node.dimensions) if hasattr(type_node, 'dimensions') else 0
             base_type = type_node.name if hasattr(type_node, 'name') else ''
-            return base_type + '[]' * array_depth
+            type_name = base_type + '[]' * array_depth
+        else:
+            type_name = str(type_node)
+        type_name = sys.intern(type_name)
         
-        return str(type_node)
+        self._type_name_cache[id(type_node)] = (type_node, type_name)
+        return type_name
 
     def _resolve_variable_type(self, node, current_type):
         """解析变量类型"""
@@ -412,48 +1607,51 @@ class JavaASTExtractor:
             else:
                 method_name = node.name
             
-            qualified_name = f"{type_name}.{method_name}"
-            
             # 处理方法重载
-            if qualified_name in self.method_index:
-                param_types = [self._get_type_name(p.type) for p in node.parameters] if hasattr(node, 'parameters') else []
-                if param_types:
-                    qualified_name = f"{qualified_name}({','.join(param_types)})"
+            qualified_name = _index_method_name(
+                self.method_index, f"{type_name}.{method_name}",
+                lambda: [self._get_type_name(p.type) for p in node.parameters or ()])
             
             # 获取行号信息
-            start_line = node.position.line if hasattr(node, 'position') and node.position else None
-            end_line = self._find_node_end_line(node)
-            
-            # 获取方法源代码
-            source_code = None
-            if start_line and end_line:
+            start_line = node.position.line if node.position else None
+            lines = None
+            if start_line:
                 try:
-                    with open(os.path.join(self.src_root, file_path), 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                        # 获取方法的源代码（包括开始和结束行）
-                        source_code = ''.join(lines[start_line-1:end_line])
+                    # 源码行按文件缓存，同一文件的各个方法不再重复读取整个文件
+                    lines = self._get_source_lines(os.path.normpath(file_path))
                 except Exception as e:
                     self.logger.error(f"读取方法源代码时出错: {str(e)}")
+            end_line = self._method_end_line(node, lines)
             
-            method_info = {
-                'name': method_name,
-                'qualified_name': qualified_name,
-                'file_path': file_path,
-                'class_name': type_name,
-                'start_line': start_line,
-                'end_line': end_line,
-                'type': method_type,
-                'modifiers': set(node.modifiers) if hasattr(node, 'modifiers') else set(),
-                'parameters': self._get_method_parameters(node),
-                'return_type': self._get_method_return_type(node) if method_type != 'constructor' else None,
-                'throws': list(node.throws) if hasattr(node, 'throws') and node.throws else [],
-                'signature': self._get_method_signature(node),
-                'source_code': source_code
-            }
+            # 获取方法的源代码（包括开始和结束行）
+            source_code = None
+            if start_line and end_line and lines is not None:
+                source_code = ''.join(lines[start_line-1:end_line])
+            
+            # 参数和返回类型只解析一次，方法信息和签名共用
+            parameters = self._get_method_parameters(node)
+            return_type = self._get_method_return_type(node) if method_type != 'constructor' else None
+            method_info = MethodInfo(
+                name=method_name,
+                qualified_name=qualified_name,
+                file_path=file_path,
+                class_name=type_name,
+                start_line=_line_number(start_line),
+                end_line=_line_number(end_line),
+                type=method_type,
+                modifiers=_modifier_set(node.modifiers or ()),
+                parameters=parameters,
+                return_type=return_type,
+                throws=list(node.throws) if node.throws else [],
+                signature=self._get_method_signature(node, parameters, return_type),
+                source_code=source_code
+            )
             
             self.method_index[qualified_name] = method_info
+            if self._index_entries is not None:
+                self._index_entries.append(method_info)
             self.call_graph.add_method(qualified_name, method_info)
-            self.logger.debug(f"添加{method_type}到索引: {qualified_name}")
+            self.logger.debug("添加%s到索引: %s", method_type, qualified_name)
             
         except Exception as e:
             self.logger.error(f"添加方法到索引时出错: {str(e)}")
@@ -466,54 +1664,55 @@ class JavaASTExtractor:
             node: 方法节点（MethodDeclaration或ConstructorDeclaration）
             
         Returns:
-            set: 修饰符集合，如 {'public', 'static', 'final'}
+            frozenset: 修饰符集合，如 {'public', 'static', 'final'}
         """
         try:
-            modifiers = set()
-            if hasattr(node, 'modifiers'):
-                modifiers.update(node.modifiers)
+            modifiers = set(node.modifiers or ())
                 
             # 如果是接口方法，默认添加public和abstract修饰符
+            # （方法声明的父节点在遍历语法树时记录到 _parent_map，以 id(方法节点) 为键）
             if (isinstance(node, javalang.tree.MethodDeclaration) and 
-                isinstance(self._get_parent(node), javalang.tree.InterfaceDeclaration)):
+                isinstance(self._parent_map.get(id(node)), javalang.tree.InterfaceDeclaration)):
                 modifiers.add('public')
                 modifiers.add('abstract')
                 
-            return modifiers
+            return _modifier_set(modifiers)
         except Exception as e:
             self.logger.error(f"获取方法修饰符时出错: {str(e)}")
-            return set()
+            return _modifier_set(())
 
-    def _get_method_signature(self, node):
+    def _get_method_signature(self, node, parameters=None, return_type=None):
         """获取方法的完整签名
         
         Args:
             node: javalang.tree.MethodDeclaration 或 javalang.tree.ConstructorDeclaration
+            parameters: 可选，_get_method_parameters 已解析出的参数列表，给出时不再重新解析参数类型
+            return_type: 可选，已解析出的返回类型
             
         Returns:
             str: 方法签名，如 'public static void main(String[] args)'
         """
         try:
+            cached = self._signature_cache.get(id(node))
+            if cached is not None and cached[0] is node:
+                return cached[1]
+            
             # 获取修饰符
-            modifiers = node.modifiers if hasattr(node, 'modifiers') else set()
-            modifiers_str = ' '.join(sorted(modifiers))
+            modifiers_str = _modifier_string(node.modifiers or ())
             
             # 获取返回类型（构造函数没有返回类型）
-            return_type = ''
-            if isinstance(node, javalang.tree.MethodDeclaration):
+            if not isinstance(node, javalang.tree.MethodDeclaration):
+                return_type = ''
+            elif return_type is None:
                 return_type = self._get_type_name(node.return_type)
             
             # 获取方法名
             name = node.name
             
             # 获取参数列表
-            params = []
-            if hasattr(node, 'parameters') and node.parameters:
-                for param in node.parameters:
-                    param_type = self._get_type_name(param.type)
-                    if param.varargs:
-                        param_type += '...'
-                    params.append(f"{param_type} {param.name}")
+            if parameters is None:
+                parameters = self._get_method_parameters(node) if node.parameters else []
+            params = [f"{param['type']} {param['name']}" for param in parameters]
             
             # 构建完整签名
             signature_parts = []
@@ -525,61 +1724,20 @@ class JavaASTExtractor:
             signature_parts.append(f"({', '.join(params)})")
             
             # 添加throws子句
-            if hasattr(node, 'throws') and node.throws:
+            if node.throws:
                 throws = [self._get_type_name(t) for t in node.throws]
                 signature_parts.append(f"throws {', '.join(throws)}")
             
-            return ' '.join(signature_parts)
+            # 重载和覆盖方法的签名经常相同，驻留后共享同一个字符串对象
+            signature = sys.intern(' '.join(signature_parts))
+            self._signature_cache[id(node)] = (node, signature)
+            return signature
             
         except Exception as e:
             self.logger.error(f"获取方法签名时出错: {str(e)}")
             self.logger.error(f"节点信息: {node}")
             return f"{node.name}()"  # 返回简单的备用签名
 
-    def _get_parent(self, node, root=None):
-        """获取节点的父节点
-        
-        Args:
-            node: 当前节点
-            root: 根节点（可选）
-            
-        Returns:
-            node: 父节点，如果没有找到则返回None
-        """
-        try:
-            if root is None:
-                root = self.ast_data
-                
-            def find_parent(current, target, parent=None):
-                if current is target:
-                    return parent
-                    
-                if isinstance(current, (list, tuple)):
-                    for item in current:
-                        result = find_parent(item, target, current)
-                        if result is not None:
-                            return result
-                            
-                elif isinstance(current, dict):
-                    for value in current.values():
-                        result = find_parent(value, target, current)
-                        if result is not None:
-                            return result
-                            
-                elif hasattr(current, '__dict__'):
-                    for value in current.__dict__.values():
-                        result = find_parent(value, target, current)
-                        if result is not None:
-                            return result
-                            
-                return None
-                
-            return find_parent(root, node)
-            
-        except Exception as e:
-            self.logger.error(f"获取父节点时出错: {str(e)}")
-            return None
-
     def _get_method_parameters(self, node):
         """解析方法的参数列表
         
@@ -594,7 +1752,7 @@ class JavaASTExtractor:
             for param in node.parameters:
                 param_type = self._get_type_name(param.type)
                 if param.varargs:
-                    param_type += '...'
+                    param_type = sys.intern(param_type + '...')
                 params.append({
                     'type': param_type,
                     'name': param.name
@@ -622,246 +1780,289 @@ class JavaASTExtractor:
             return 'Object'
 
     def _process_file_calls(self, file_path):
-        """处理单个文件中的方法调用"""
+        """处理单个文件中的方法调用
+
+        Returns:
+            tuple: (本文件补登记的调用者方法列表, 本文件的调用关系列表)，无法处理时返回None
+        """
         try:
-            # 获取当前类型名（类或接口）
-            current_type = self._get_current_class(file_path)
+            # 获取当前类型名（类或接口）和字段类型，优先使用第一遍记录的信息
+            normalized_path = os.path.normpath(file_path)
+            record = self.file_records.get(normalized_path)
+            if record is not None:
+                current_type, field_types = record
+            else:
+                current_type = self._get_current_class(file_path)
+                field_types = None
             if not current_type:
-                self.logger.warning(f"无法获取类型名: {file_path}")
+                self.logger.warning("无法获取类型名: %s", file_path)
                 return
 
             # 检查当前类型是否有效
             if not current_type:
-                self.logger.warning(f"无法获取当前类型: {file_path}")
+                self.logger.warning("无法获取当前类型: %s", file_path)
                 return None
             
-            # 检查当前类型下是否有任何方法
-            class_methods = [m for m in self.method_index.keys() if m.startswith(f"{current_type}.")]
-            if not class_methods:
-                self.logger.warning(f"当前类型 {current_type} 没有任何已索引的方法")
+            # 检查当前类型下是否有任何方法（调用图按类名记录了已索引的方法，不必扫描整个索引）
+            if not self.call_graph.methods_by_class.get(current_type):
+                self.logger.warning("当前类型 %s 没有任何已索引的方法", current_type)
                 # 不应该直接返回None，因为可能是新添加的类
                 # 继续处理以捕获可能的方法调用
 
-            # 解析文件
-            with open(os.path.join(self.src_root, file_path), 'r', encoding='utf-8') as f:
-                tree = javalang.parse.parse(f.read())
-
-            # 获取所有字段的类型信息
-            field_types = self._get_field_types(tree)
-            
-            self.logger.debug(f"\n开始处理文件的方法调用: {file_path}")
-            self.logger.debug(f"当前类型: {current_type}")
+            # 优先复用第一遍已解析的AST
+            tree = self._get_tree(normalized_path)
+            if normalized_path in self._files_without_calls:
+                self.logger.debug("文件中没有方法调用，跳过: %s", file_path)
+                return [], []
+
+            # 获取所有字段的类型信息（没有第一遍记录时按语法树缓存，文件未修改时不重复计算；
+            # 需要重新计算时，字段声明在下面收集方法调用的同一次遍历中取得）
+            field_nodes = None
+            if field_types is None:
+                cached = self._field_types_cache.get(normalized_path)
+                if cached is not None and cached[0] is tree:
+                    field_types = cached[1]
+                else:
+                    field_nodes = []
+            
+            self.logger.debug("\n开始处理文件的方法调用: %s", file_path)
+            self.logger.debug("当前类型: %s", current_type)
+
+            # 循环中频繁访问的属性和方法绑定为局部变量
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+            method_index = self.method_index
+            method_local_vars = self.method_local_vars
+            # 本文件的调用关系先收集起来，处理完后一次性加入调用图；
+            # 同一调用关系在文件中多次出现时只记录第一次
+            file_calls = []
+            record_call = file_calls.append
+            seen_calls = set()
+            mark_seen = seen_calls.add
+            # 本文件补登记到索引中的调用者方法，与调用关系一起返回以便缓存
+            new_methods = []
+            find_parent_method = self._find_parent_method
+            resolve_method_call = self._resolve_method_call
+            # 导入信息按文件缓存，整个文件只需取一次
+            imports = self._get_cached_imports(file_path)
+            current_package = current_type.rsplit('.', 1)[0]
+
+            # 只遍历一次AST，同时收集方法调用、构造函数调用以及（需要时）字段声明，
+            # 之后仍按先方法调用、后构造函数调用的顺序处理
+            invocation_nodes = []
+            creator_nodes = []
+            MethodInvocation = javalang.tree.MethodInvocation
+            ClassCreator = javalang.tree.ClassCreator
+            FieldDeclaration = javalang.tree.FieldDeclaration
+            for path, node in _walk_tree(tree):
+                if isinstance(node, MethodInvocation):
+                    invocation_nodes.append((path, node))
+                elif isinstance(node, ClassCreator):
+                    creator_nodes.append((path, node))
+                elif field_nodes is not None and isinstance(node, FieldDeclaration):
+                    field_nodes.append(node)
+            if field_nodes is not None:
+                field_types = self._get_field_types(tree, field_nodes)
+                self._field_types_cache[normalized_path] = (tree, field_types)
 
             # 遍历所有方法调用
-            for path, node in tree.filter(javalang.tree.MethodInvocation):
+            for path, node in invocation_nodes:
                 try:
-                    method_decl = self._find_parent_method(path)
+                    method_decl = find_parent_method(path)
                     if not method_decl:
                         continue
                     
-                    caller_method = f"{current_type}.{method_decl.name}"
-                    # 获取当前方法的局部变量
-                    method_vars = self.method_local_vars.get(caller_method, {})
-                    # 解析方法调用，传入局部变量信息
-                    callee = self._resolve_method_call(node, current_type, field_types, self._get_cached_imports(file_path), method_vars)
+                    caller_method = sys.intern(f"{current_type}.{method_decl.name}")
+                    if node.qualifier in _RESOLVER_JAVA_TYPES:
+                        # 以常见标准库类型为限定符的调用（如 String.format、Math.max）必然解析为
+                        # java.lang 下的方法，会被调用图过滤，无需再走完整的解析流程
+                        callee = f"java.lang.{node.qualifier}.{node.member}"
+                    else:
+                        # 获取当前方法的局部变量
+                        method_vars = method_local_vars.get(caller_method, {})
+                        # 解析方法调用，传入局部变量信息
+                        callee = resolve_method_call(node, current_type, field_types, imports, method_vars,
+                                                     current_package)
                     
                     if callee:
-                        self.logger.debug(f"尝试添加调用关系: {caller_method} -> {callee}")
+                        callee = sys.intern(callee)
+                        if debug:
+                            self.logger.debug("尝试添加调用关系: %s -> %s", caller_method, callee)
                         
                         # 检查调用者是否在method_index中
-                        if caller_method not in self.method_index:
+                        if caller_method not in method_index:
                             # 尝试添加调用者方法到method_index
-                            method_info = {
-                                'name': method_decl.name,
-                                'file_path': file_path,
-                                'class_name': current_type,
-                                'type': 'method',
-                                'modifiers': self._get_method_modifiers(method_decl),
-                                'signature': self._get_method_signature(method_decl)
-                            }
-                            self.method_index[caller_method] = method_info
-                            self.call_graph.add_method(caller_method, method_info)
-                            self.logger.debug(f"已添加调用者方法到索引: {caller_method}")
+                            method_info = MethodInfo(
+                                name=method_decl.name,
+                                file_path=file_path,
+                                class_name=current_type,
+                                type='method',
+                                modifiers=self._get_method_modifiers(method_decl),
+                                signature=self._get_method_signature(method_decl)
+                            )
+                            method_index[caller_method] = method_info
+                            new_methods.append((caller_method, method_info))
+                            if debug:
+                                self.logger.debug("已添加调用者方法到索引: %s", caller_method)
 
                         # 检查被调用者是否在method_index中
-                        if callee not in self.method_index:
-                            self.logger.debug(f"记录对外部方法的调用: {callee}")
+                        if debug and callee not in method_index:
+                            self.logger.debug("记录对外部方法的调用: %s", callee)
                             
                         # 添加调用关系
-                        self.call_graph.add_call(caller_method, callee)
-                        self.logger.debug(f"已添加调用关系: {caller_method} -> {callee}")
+                        call = (caller_method, callee)
+                        if call not in seen_calls:
+                            mark_seen(call)
+                            record_call(call)
+                        if debug:
+                            self.logger.debug("已添加调用关系: %s -> %s", caller_method, callee)
 
                 except Exception as e:
                     self.logger.error(f"处理方法调用时出错: {str(e)}")
                     continue
 
             # 处理构造函数调用
-            for path, node in tree.filter(javalang.tree.ClassCreator):
+            for path, node in creator_nodes:
                 try:
-                    method_decl = self._find_parent_method(path)
+                    method_decl = find_parent_method(path)
                     if not method_decl:
                         continue
 
-                    caller_method = f"{current_type}.{method_decl.name}"
+                    caller_method = sys.intern(f"{current_type}.{method_decl.name}")
                     callee_class = node.type.name
                     
                     # 解析完整的构造函数调用
                     if callee_class in field_types:
                         callee = f"{field_types[callee_class]}.{callee_class}"
+                    elif callee_class in imports:
+                        callee = f"{imports[callee_class]}.{callee_class}"
                     else:
-                        imports = self._get_cached_imports(file_path)
-                        if callee_class in imports:
-                            callee = f"{imports[callee_class]}.{callee_class}"
-                        else:
-                            current_package = current_type.rsplit('.', 1)[0]
-                            callee = f"{current_package}.{callee_class}.{callee_class}"
+                        callee = f"{current_package}.{callee_class}.{callee_class}"
 
                     if callee:
-                        self.logger.debug(f"尝试添加构造函数调用: {caller_method} -> {callee}")
+                        callee = sys.intern(callee)
+                        if debug:
+                            self.logger.debug("尝试添加构造函数调用: %s -> %s", caller_method, callee)
                         
                         # 检查调用者是否在method_index中
-                        if caller_method not in self.method_index:
+                        if caller_method not in method_index:
                             # 尝试添加调用者方法到method_index
-                            method_info = {
-                                'name': method_decl.name,
-                                'file_path': file_path,
-                                'class_name': current_type,
-                                'type': 'method',
-                                'modifiers': self._get_method_modifiers(method_decl),
-                                'signature': self._get_method_signature(method_decl)
-                            }
-                            self.method_index[caller_method] = method_info
-                            self.call_graph.add_method(caller_method, method_info)
-                            self.logger.debug(f"已添加调用者方法到索引: {caller_method}")
+                            method_info = MethodInfo(
+                                name=method_decl.name,
+                                file_path=file_path,
+                                class_name=current_type,
+                                type='method',
+                                modifiers=self._get_method_modifiers(method_decl),
+                                signature=self._get_method_signature(method_decl)
+                            )
+                            method_index[caller_method] = method_info
+                            new_methods.append((caller_method, method_info))
+                            if debug:
+                                self.logger.debug("已添加调用者方法到索引: %s", caller_method)
 
                         # 添加调用关系
-                        self.call_graph.add_call(caller_method, callee)
-                        self.logger.debug(f"已添加构造函数调用关系: {caller_method} -> {callee}")
+                        call = (caller_method, callee)
+                        if call not in seen_calls:
+                            mark_seen(call)
+                            record_call(call)
+                        if debug:
+                            self.logger.debug("已添加构造函数调用关系: %s -> %s", caller_method, callee)
 
                 except Exception as e:
                     self.logger.error(f"处理构造函数调用时出错: {str(e)}")
                     continue
 
+            self.call_graph.add_methods(new_methods)
+            self.call_graph.add_calls(file_calls)
+            return new_methods, file_calls
+
         except Exception as e:
             self.logger.error(f"处理文件调用时出错 {file_path}: {str(e)}")
             import traceback
             self.logger.error(traceback.format_exc())
 
 
-    def _resolve_method_call(self, node, current_type, field_types, imports, method_vars):
-        """解析方法调用"""
+    def _resolve_method_call(self, node, current_type, field_types, imports, method_vars, current_package=None):
+        """解析方法调用
+
+        Args:
+            node: 方法调用节点
+            current_type: 调用所在的类型（包括包名）
+            field_types: 字段名到类型的映射
+            imports: 当前文件的导入信息
+            method_vars: 调用所在方法的局部变量类型
+            current_package: 可选，当前类型所在的包名；调用方按文件计算一次后传入，不给出时从 current_type 推出
+
+        Returns:
+            str: 被调用方法的完整限定名，无法解析时返回None
+        """
         try:
             member = node.member
             qualifier = node.qualifier
-            
-            # 定义常见的Java标准库类型
-            common_java_types = {
-                # 基础类型
-                'Object', 'String', 'Integer', 'Long', 'Double', 'Float', 'Boolean', 'Byte', 'Short', 'Character',
-                
-                # 异常类型
-                'Exception', 'RuntimeException', 'IllegalArgumentException', 'NullPointerException',
-                'IllegalStateException', 'UnsupportedOperationException', 'IndexOutOfBoundsException',
-                'NoSuchElementException', 'ClassCastException', 'ArrayIndexOutOfBoundsException',
-                
-                # 集合类型
-                'List', 'ArrayList', 'LinkedList', 'Set', 'HashSet', 'Map', 'HashMap', 'TreeMap',
-                'Collection', 'Collections', 'Arrays', 'Iterator', 'Iterable',
-                
-                # 其他常用类型
-                'StringBuilder', 'StringBuffer', 'Math', 'System', 'Class', 'Thread', 'Runnable',
-                'Optional', 'Stream', 'Collectors', 'Objects'
-            }
-            
-            self.logger.debug(f"\n=== 解析方法调用 ===")
-            self.logger.debug(f"当前类型: {current_type}")
-            self.logger.debug(f"方法名: {member}")
-            self.logger.debug(f"限定符: {qualifier}")
-            self.logger.debug(f"字段类型: {field_types}")
-            
-            def resolve_qualifier_type(qual):
-                if isinstance(qual, str):
-                    # 0. 检查是否是常见Java类型
-                    if qual in common_java_types:
-                        self.logger.debug(f"跳过Java标准库类型: {qual}")
-                        return f"java.lang.{qual}"
-                    
-                    # 1. 检查局部变量
-                    if qual in method_vars:
-                        var_type = method_vars[qual]
-                        self.logger.debug(f"找到局部变量类型: {qual} -> {var_type}")
-                        return var_type
-                    
-                    # 2. 检查字段
-                    elif qual in field_types:
-                        field_type = field_types[qual]
-                        self.logger.debug(f"找到字段类型: {qual} -> {field_type}")
-                        return field_type
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+            
+            if debug:
+                self.logger.debug("\n=== 解析方法调用 ===")
+                self.logger.debug("当前类型: %s", current_type)
+                self.logger.debug("方法名: %s", member)
+                self.logger.debug("限定符: %s", qualifier)
+                self.logger.debug("字段类型: %s", field_types)
+            
+            # 解析限定符的类型（依次检查常见Java类型、局部变量、字段、导入，最后按标准库类或同包类处理）
+            qualifier_type = None
+            if isinstance(qualifier, str):
+                if qualifier in _RESOLVER_JAVA_TYPES:
+                    qualifier_type = f"java.lang.{qualifier}"
+                    if debug:
+                        self.logger.debug("跳过Java标准库类型: %s", qualifier)
+                elif qualifier in method_vars:
+                    qualifier_type = method_vars[qualifier]
+                    if debug:
+                        self.logger.debug("找到局部变量类型: %s -> %s", qualifier, qualifier_type)
+                elif qualifier in field_types:
+                    qualifier_type = field_types[qualifier]
+                    if debug:
+                        self.logger.debug("找到字段类型: %s -> %s", qualifier, qualifier_type)
+                elif qualifier in imports:
+                    qualifier_type = imports[qualifier]
+                    if debug:
+                        self.logger.debug("找到类型导入: %s -> %s", qualifier, qualifier_type)
+                else:
+                    # 如果限定符包含点号，可能是标准库的静态字段引用
+                    if '.' in qualifier:
+                        head, _, rest = qualifier.partition('.')
+                        if head in _STANDARD_LIB_CLASSES:
+                            qualifier_type = f"{_STANDARD_LIB_CLASSES[head]}.{rest}"
+                            if debug:
+                                self.logger.debug("解析为标准库静态字段引用: %s", qualifier_type)
                     
-                    # 3. 检查是否是类名(静态方法调用)
-                    elif qual in imports:
-                        class_name = imports[qual]
-                        self.logger.debug(f"找到类型导入: {qual} -> {class_name}")
-                        return class_name
-                    else:
-                        # 检查是否是标准库类
-                        standard_lib_classes = {
-                            'Object': 'java.lang.Object',
-                            'String': 'java.lang.String',
-                            'Integer': 'java.lang.Integer',
-                            'Long': 'java.lang.Long',
-                            'Double': 'java.lang.Double',
-                            'Float': 'java.lang.Float',
-                            'Boolean': 'java.lang.Boolean',
-                            'Byte': 'java.lang.Byte',
-                            'Short': 'java.lang.Short',
-                            'Character': 'java.lang.Character',
-                            'System': 'java.lang.System',
-                            'Thread': 'java.lang.Thread',
-                            'Exception': 'java.lang.Exception',
-                            'RuntimeException': 'java.lang.RuntimeException',
-                            'Throwable': 'java.lang.Throwable',
-                            'Class': 'java.lang.Class',
-                            'Math': 'java.lang.Math',
-                            'StringBuilder': 'java.lang.StringBuilder',
-                            'StringBuffer': 'java.lang.StringBuffer'
-                        }
-                        
-                        # 如果限定符包含点号，可能是标准库的静态字段引用
-                        if '.' in qual:
-                            parts = qual.split('.')
-                            if parts[0] in standard_lib_classes:
-                                full_name = f"{standard_lib_classes[parts[0]]}.{'.'.join(parts[1:])}"
-                                self.logger.debug(f"解析为标准库静态字段引用: {full_name}")
-                                return full_name
-                        
-                        # 检查是否是标准库类
-                        if qual in standard_lib_classes:
-                            self.logger.debug(f"解析为标准库类: {standard_lib_classes[qual]}")
-                            return standard_lib_classes[qual]
-                            
-                        # 如果不是标准库类，尝试解析为同包下的类
-                        current_package = current_type.rsplit('.', 1)[0]
-                        possible_class = f"{current_package}.{qual}"
-                        self.logger.debug(f"尝试解析为同包类: {possible_class}")
-                        return possible_class
+                    # 检查是否是标准库类
+                    if qualifier_type is None and qualifier in _STANDARD_LIB_CLASSES:
+                        qualifier_type = _STANDARD_LIB_CLASSES[qualifier]
+                        if debug:
+                            self.logger.debug("解析为标准库类: %s", qualifier_type)
                     
-                return None
+                    # 如果不是标准库类，尝试解析为同包下的类
+                    if qualifier_type is None:
+                        if current_package is None:
+                            current_package = current_type.rsplit('.', 1)[0]
+                        qualifier_type = f"{current_package}.{qualifier}"
+                        if debug:
+                            self.logger.debug("尝试解析为同包类: %s", qualifier_type)
             
-            # 解析限定符的类型
-            qualifier_type = resolve_qualifier_type(qualifier)
             if qualifier_type:
                 callee = f"{qualifier_type}.{member}"
-                self.logger.debug(f"解析出的方法调用: {callee}")
+                if debug:
+                    self.logger.debug("解析出的方法调用: %s", callee)
                 
-                # 规范化调用名称
-                callee = re.sub(r'\.+', '.', callee)
+                # 规范化调用名称，合并连续的点号（通常不需要，直接用字符串操作代替正则）
+                while '..' in callee:
+                    callee = callee.replace('..', '.')
                 callee = callee.strip('.')
                 return callee
             
             # 如果没有限定符，检查是否是Java标准库类型的直接调用
-            if not qualifier and member in common_java_types:
-                self.logger.debug(f"跳过Java标准库类型的直接调用: {member}")
+            if not qualifier and member in _RESOLVER_JAVA_TYPES:
+                self.logger.debug("跳过Java标准库类型的直接调用: %s", member)
                 return f"java.lang.{member}"
             
             return None
@@ -873,8 +2074,8 @@ class JavaASTExtractor:
     def analyze_file(self, file_path, modified_lines):
         """分析单个文件的修改"""
         try:
-            self.logger.info(f"开始分析文件: {file_path}")
-            self.logger.info(f"修改的行号: {modified_lines}")
+            self.logger.info("开始分析文件: %s", file_path)
+            self.logger.info("修改的行号: %s", modified_lines)
             
             # 确保已建立项目索引
             if not self.method_index:
@@ -884,7 +2085,7 @@ class JavaASTExtractor:
             affected_methods, method_line_map = self.find_methods_by_lines(file_path, modified_lines)
             
             if not affected_methods:
-                self.logger.info(f"未找到受影响的方法: {file_path}")
+                self.logger.info("未找到受影响的方法: %s", file_path)
                 return {
                     'affected_methods': [],
                     'method_line_map': method_line_map,
@@ -894,7 +2095,7 @@ class JavaASTExtractor:
                     }
                 }
             
-            self.logger.debug(f"受影响的方法: {affected_methods}")
+            self.logger.debug("受影响的方法: %s", affected_methods)
             
             # 获取受影响方法的完整调用关系
             method_calls = self._get_complete_call_relations(affected_methods)
@@ -940,8 +2141,8 @@ class JavaASTExtractor:
                 'method_sources': method_sources  # 添加方法源代码信息
             }
             
-            self.logger.info(f"分析完成: {file_path}")
-            self.logger.debug(f"分析结果: {result}")
+            self.logger.info("分析完成: %s", file_path)
+            self.logger.debug("分析结果: %s", result)
             return result
 
         except Exception as e:
@@ -960,108 +2161,112 @@ class JavaASTExtractor:
             tuple: (受影响的方法列表, 方法行号映射)
         """
         try:
-            # 解析文件获取原始AST
-            with open(os.path.join(self.src_root, file_path), 'r', encoding='utf-8') as f:
-                source = f.read()
-                tree = javalang.parse.parse(source)
+            # 获取文件的AST，建立索引时已解析过且文件未修改时直接复用
+            normalized_path = os.path.normpath(file_path)
+            tree = self._get_tree(normalized_path)
+            source_lines = self._get_source_lines(normalized_path)
 
-            affected_methods = []
-            method_line_map = {}
-            current_type = self._get_current_class(file_path)
-            
+            current_type = self._get_current_class(file_path, tree)
             if not current_type:
                 self.logger.error(f"无法获取类型名: {file_path}")
                 return [], {}
 
-            # 处理普通方法
-            for path, node in tree.filter(javalang.tree.MethodDeclaration):
-                method_name = node.name
-                qualified_name = f"{current_type}.{method_name}"
-                
-                # 获取方法的起始行和结束行
-                start_line = node.position.line if node.position else None
-                end_line = self._find_node_end_line(node)
-                
-                if start_line and end_line:
-                    method_line_map[qualified_name] = {
-                        'start_line': start_line,
-                        'end_line': end_line
-                    }
-                    
-                    # 检查是否有修改行落在这个方法范围内
-                    for line in modified_lines:
-                        if start_line <= line <= end_line:
-                            affected_methods.append(qualified_name)
-                            self.logger.debug(f"找到受影响的方法: {qualified_name} (行 {start_line}-{end_line})")
-                            break
+            method_line_map, method_ranges = self._get_method_ranges(normalized_path, tree, source_lines, current_type)
+            affected_methods = []
+            sorted_lines = sorted(modified_lines)
 
-            # 处理构造函数
-            for path, node in tree.filter(javalang.tree.ConstructorDeclaration):
-                method_name = node.name
-                qualified_name = f"{current_type}.{method_name}"
-                
-                # 获取构造函数的起始行和结束行
+            for qualified_name, start_line, end_line, kind in _ranges_touching_lines(method_ranges, sorted_lines):
+                affected_methods.append(qualified_name)
+                self.logger.debug("找到受影响的%s: %s (行 %s-%s)", kind, qualified_name, start_line, end_line)
+
+            self.logger.info("文件 %s 中找到 %s 个受影响的方法", file_path, len(affected_methods))
+            # 去重并保持方法在文件中出现的顺序；行号映射是缓存内容，返回副本
+            return list(dict.fromkeys(affected_methods)), dict(method_line_map)
+
+        except Exception as e:
+            self.logger.error(f"查找受影响方法时出错 {file_path}: {str(e)}")
+            return [], {}
+
+    def _get_method_ranges(self, normalized_path, tree, source_lines, current_type):
+        """获取文件中所有方法和构造函数的行号范围
+
+        结果按文件缓存，语法树、源码行或主类名变化时重新计算；同一文件多次查找受影响方法时
+        不再重复收集声明和配对花括号。
+
+        Args:
+            normalized_path: 经过 os.path.normpath 处理的相对路径
+            tree: 文件的语法树
+            source_lines: 文件的源码行列表
+            current_type: 文件的主类名（包括包名）
+
+        Returns:
+            tuple: (方法行号映射, [(完整限定名, 起始行, 结束行, 类别)])
+        """
+        cached = self._method_ranges_cache.get(normalized_path)
+        if (cached is not None and cached[0] is tree and cached[1] is source_lines
+                and cached[2] == current_type):
+            return cached[3], cached[4]
+
+        # 文件修改后重新解析得到的新语法树也会在这里补充父节点表
+        declarations = _collect_declarations(tree, self._parent_map)
+        end_lines = declarations.end_lines
+
+        # 先收集所有方法和构造函数的行号范围，再统一与修改行匹配
+        method_line_map = {}
+        method_ranges = []
+        for nodes, kind in ((declarations.methods, '方法'), (declarations.constructors, '构造函数')):
+            for node in nodes:
+                qualified_name = f"{current_type}.{node.name}"
+
+                # 获取起始行和结束行，结束行与 method_index 中记录的一致
                 start_line = node.position.line if node.position else None
-                end_line = self._find_node_end_line(node)
-                
+                end_line = self._method_end_line(node, source_lines, end_lines.get(node))
+
                 if start_line and end_line:
                     method_line_map[qualified_name] = {
                         'start_line': start_line,
                         'end_line': end_line
                     }
-                    
-                    # 检查是否有修改行落在这个构造函数范围内
-                    for line in modified_lines:
-                        if start_line <= line <= end_line:
-                            affected_methods.append(qualified_name)
-                            self.logger.debug(f"找到受影响的构造函数: {qualified_name} (行 {start_line}-{end_line})")
-                            break
-
-            self.logger.info(f"文件 {file_path} 中找到 {len(affected_methods)} 个受影响的方法")
-            return list(set(affected_methods)), method_line_map
+                    method_ranges.append((qualified_name, start_line, end_line, kind))
 
-        except Exception as e:
-            self.logger.error(f"查找受影响方法时出错 {file_path}: {str(e)}")
-            return [], {}
+        self._method_ranges_cache[normalized_path] = (tree, source_lines, current_type,
+                                                      method_line_map, method_ranges)
+        return method_line_map, method_ranges
 
     def _get_complete_call_relations(self, affected_methods):
-        """获取方法的完整调用关系"""
+        """获取方法的完整调用关系
+
+        每个方法只需在调用图中查找一次，调用图中不存在的方法返回空的调用关系。
+        调用图中的调用关系以集合保存，这里只在返回时转换为排序后的元组，
+        既不暴露调用图内部的集合，也保证输出的JSON顺序稳定。
+        """
         try:
-            complete_calls = {
-                'callers': {},
-                'callees': {}
-            }
-            
-            print("\n========= 开始获取方法的调用关系 =========")
-            print(f"受影响的方法列表: {affected_methods}")
-            
+            edges = self.call_graph.edges
+            empty = {'callers': (), 'callees': ()}
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("受影响的方法列表: %s", affected_methods)
+                for method_name in affected_methods:
+                    if method_name not in edges:
+                        self.logger.debug("✗ 在调用图中找不到方法: %s", method_name)
+
+            # 一次遍历同时取出调用者和被调用者，重复的方法只查找一次
+            callers = {}
+            callees = {}
             for method_name in affected_methods:
-                print(f"\n===== 处理受影响的方法: {method_name} =====")
-                
-                # 直接从调用图中获取调用关系
-                if method_name in self.call_graph.edges:
-                    callers = list(self.call_graph.edges[method_name]['callers'])
-                    callees = list(self.call_graph.edges[method_name]['callees'])
-                    
-                    print(f"找到方法的调用关系:")
-                    print(f"调用者: {callers}")
-                    print(f"被调用者: {callees}")
-                    
-                    # 直接添加到结果中
-                    complete_calls['callers'][method_name] = {'callers': callers}
-                    complete_calls['callees'][method_name] = {'callees': callees}
-                else:
-                    print(f"✗ 在调用图中找不到方法: {method_name}")
-                    complete_calls['callers'][method_name] = {'callers': []}
-                    complete_calls['callees'][method_name] = {'callees': []}
-            
-            print("\n========= 调用关系获取完成 =========")
-            return complete_calls
+                if method_name in callers:
+                    continue
+                edge = edges.get(method_name, empty)
+                callers[method_name] = {'callers': tuple(sorted(edge['callers']))}
+                callees[method_name] = {'callees': tuple(sorted(edge['callees']))}
+            return {
+                'callers': callers,
+                'callees': callees,
+            }
             
         except Exception as e:
-            print(f"获取调用关系时出错: {str(e)}")
+            self.logger.error(f"获取调用关系时出错: {str(e)}")
             import traceback
-            traceback.print_exc()
+            self.logger.error(traceback.format_exc())
             return {
                 'callers': {},
                 'callees': {}
@@ -1097,9 +2302,14 @@ class JavaASTExtractor:
                 "analysis_result": result
             }
             
-            # 保存为JSON文件
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result_with_metadata, f, indent=2, ensure_ascii=False)
+            # 保存为JSON文件，优先使用 orjson
+            if orjson is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(result_with_metadata, default=list,
+                                         option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(result_with_metadata, f, indent=2, ensure_ascii=False, default=list)
             self.logger.info(f"\n分析结果已保存到: {output_file}")
             return output_file
         except Exception as e:
@@ -1118,86 +2328,62 @@ class JavaASTExtractor:
         """
         changes = {}
         current_file = None
+        modified_lines = None  # 当前文件的修改行列表，按出现顺序追加
         current_line_number = 0
         in_hunk = False
         
-        # 使用正则表达式匹配diff头和块头
-        file_pattern = re.compile(r'diff --git (?:src://)?(.+?) (?:dst://)?.*')
-        hunk_pattern = re.compile(r'@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@')
-        
-        for line in diff_text.splitlines():
-            # 检查是否是新文件的开始
-            file_match = file_pattern.match(line)
-            if file_match:
-                # 提取相对路径，移除可能的 src:// 前缀
-                current_file = file_match.group(1)
-                # 确保使用正确的路径分隔符并移除开头的 src/
-                current_file = current_file.replace('\\', os.path.sep).replace('/', os.path.sep)
-                if current_file.startswith('src' + os.path.sep):
-                    current_file = current_file[4:]  # 移除开头的 'src/'
-                self.logger.debug("处理文件: %s", current_file)
-                changes[current_file] = {'modified_lines': set()}
-                in_hunk = False
-                continue
-            
-            # 检查是否是块头（@@ 标记）
-            hunk_match = hunk_pattern.match(line)
-            if hunk_match:
-                in_hunk = True
-                current_line_number = int(hunk_match.group(1))
-                continue
+        # 逐行读取，不必先用 splitlines() 生成整个行列表；newline=None 统一换行符
+        for line in io.StringIO(diff_text, newline=None):
+            line = line.rstrip('\n')
+            # 按首字符分类：文件头和块头分别只会以 d、@ 开头，其余的行不必尝试这两个判断
+            first_char = line[:1]
+            if first_char == 'd':
+                # 检查是否是新文件的开始（先用前缀判断，只对可能的行执行正则）
+                file_match = _DIFF_FILE_RE.match(line) if line.startswith('diff --git ') else None
+                if file_match:
+                    # 提取相对路径，移除可能的 src:// 前缀
+                    current_file = file_match.group(1)
+                    # 确保使用正确的路径分隔符并移除开头的 src/
+                    current_file = current_file.replace('\\', os.path.sep).replace('/', os.path.sep)
+                    if current_file.startswith('src' + os.path.sep):
+                        current_file = current_file[4:]  # 移除开头的 'src/'
+                    self.logger.debug("处理文件: %s", current_file)
+                    modified_lines = []
+                    changes[current_file] = {'modified_lines': modified_lines}
+                    in_hunk = False
+                    continue
+            elif first_char == '@':
+                # 检查是否是块头（@@ 标记）
+                hunk_match = _DIFF_HUNK_RE.match(line)
+                if hunk_match:
+                    in_hunk = True
+                    current_line_number = int(hunk_match.group(1))
+                    continue
             
             # 处理修改的行
             if in_hunk and current_file:
-                if line.startswith('+') and not line.startswith('+++'):
-                    changes[current_file]['modified_lines'].add(current_line_number)
+                # 块内行号只增不减，重复的行号（删除行后紧跟新增行）总是相邻出现，
+                # 与上一个行号比较即可去重，不必使用集合
+                if first_char == '+' and not line.startswith('+++'):
+                    if not modified_lines or modified_lines[-1] != current_line_number:
+                        modified_lines.append(current_line_number)
                     current_line_number += 1
-                elif line.startswith('-') and not line.startswith('---'):
+                elif first_char == '-' and not line.startswith('---'):
                     # 对于删除的行，我们也记录相应位置
-                    changes[current_file]['modified_lines'].add(current_line_number)
-                elif not line.startswith('\ No newline at end of file'):  # 忽略 "\ No newline at end of file"
+                    if not modified_lines or modified_lines[-1] != current_line_number:
+                        modified_lines.append(current_line_number)
+                elif not line.startswith('\\ No newline at end of file'):  # 忽略 "\ No newline at end of file"
                     current_line_number += 1
 
-        # 将集合转换为排序后的列表
+        # 各个块按行号顺序出现时列表已经有序且无重复；块顺序异常时才排序去重
         for file_path in changes:
-            changes[file_path]['modified_lines'] = sorted(list(changes[file_path]['modified_lines']))
+            lines = changes[file_path]['modified_lines']
+            if any(a >= b for a, b in zip(lines, lines[1:])):
+                changes[file_path]['modified_lines'] = sorted(set(lines))
             self.logger.debug("文件 %s 的修改行: %s", file_path, changes[file_path]['modified_lines'])
         
         return changes
 
-    def _get_parent(self, node):
-        """
-        获取AST节点的父节点。
-        由于javalang的AST不直接支持父节点引用，我们需要手动实现。
-
-        Args:
-            node (dict): 当前AST节点
-
-        Returns:
-            dict: 父节点，如果没有找到则返回None
-        """
-        def find_parent(current_node, target_node, parent=None):
-            if not isinstance(current_node, (dict, list)):
-                return None
-                
-            if current_node is target_node:
-                return parent
-                
-            if isinstance(current_node, dict):
-                for value in current_node.values():
-                    result = find_parent(value, target_node, current_node)
-                    if result is not None:
-                        return result
-            elif isinstance(current_node, list):
-                for item in current_node:
-                    result = find_parent(item, target_node, current_node)
-                    if result is not None:
-                        return result
-            return None
-                
-        # 从AST根节点开始搜索
-        return find_parent(self.ast_data, node)
-
     def _get_cached_imports(self, file_path):
         """获取缓存的导入信息
         
@@ -1209,14 +2395,16 @@ class JavaASTExtractor:
         """
         if file_path not in self.import_cache:
             try:
-                # 从method_index中获取类型信息
-                found_types = [t for t in self.method_index.items() if t[1].get('file_path') == file_path]
-                if not found_types:
-                    self.logger.warning(f"找不到文件对应的类型信息: {file_path}")
+                # 优先通过文件到类型的反向索引查找，找不到时再扫描method_index
+                type_info = self.method_index.get(self._file_types.get(file_path))
+                if type_info is None or type_info.get('file_path') != file_path:
+                    type_info = next((info for info in self.method_index.values()
+                                      if info.get('file_path') == file_path), None)
+                if type_info is None:
+                    self.logger.warning("找不到文件对应的类型信息: %s", file_path)
                     return {}
                     
                 # 使用第一个找到的类型的包名和导入信息
-                type_info = found_types[0][1]
                 package_name = type_info.get('package')
                 imports = type_info.get('imports', {})
                 
@@ -1226,7 +2414,7 @@ class JavaASTExtractor:
                 })
                 
                 self.import_cache[file_path] = imports
-                self.logger.debug(f"已缓存导入信息: {file_path} -> {imports}")
+                self.logger.debug("已缓存导入信息: %s -> %s", file_path, imports)
                 
             except Exception as e:
                 self.logger.error(f"处理导入信息时出错 {file_path}: {str(e)}")
@@ -1240,63 +2428,49 @@ class JavaASTExtractor:
             self._get_cached_imports(file_path)  # 这会同时缓存包名
         return self.import_cache[file_path].get('package')
 
-    def _get_current_class(self, file_path):
-        """获取当前文件的主类名（包括包名）"""
-        try:
-            with open(os.path.join(self.src_root, file_path), 'r', encoding='utf-8') as f:
-                tree = javalang.parse.parse(f.read())
-
-            # 获取包名
-            package_name = None
-            for _, node in tree.filter(javalang.tree.PackageDeclaration):
-                if isinstance(node.name, list):
-                    package_name = '.'.join(str(n.value) for n in node.name)
-                else:
-                    package_name = str(node.name)
-                break
-
-            self.logger.debug(f"包名: {package_name}")
+    def _get_current_class(self, file_path, tree=None):
+        """获取当前文件的主类名（包括包名）
 
-            # 获取所有顶层类型声明
-            declarations = []
-            if hasattr(tree, 'types'):
-                declarations.extend(tree.types)
+        结果按文件缓存，同一棵语法树只解析一次类型信息。
 
-            for declaration in declarations:
-                # 获取类型名
-                type_name = declaration.name
-                qualified_name = f"{package_name}.{type_name}" if package_name else type_name
-                
-                # 记录类型信息
-                type_info = {
-                    'kind': type(declaration).__name__,
-                    'modifiers': set(declaration.modifiers) if hasattr(declaration, 'modifiers') else set(),
-                    'superclass': None,
-                    'interfaces': [],
-                    'file_path': file_path
-                }
+        Args:
+            file_path: 源文件路径
+            tree: 已解析的AST，为None时从AST缓存获取
+        """
+        try:
+            normalized_path = os.path.normpath(file_path)
+            if tree is None:
+                tree = self._get_tree(normalized_path)
+        except Exception as e:
+            self.logger.error(f"获取当前类型名时出错 ({file_path}): {str(e)}")
+            return None
 
-                # 处理继承关系
-                if hasattr(declaration, 'extends'):
-                    if declaration.extends:
-                        if isinstance(declaration.extends, list):
-                            type_info['interfaces'].extend(str(ext) for ext in declaration.extends)
-                        else:
-                            type_info['superclass'] = str(declaration.extends)
+        cached = self._current_class_cache.get(normalized_path)
+        if cached is not None and cached[0] is tree:
+            return cached[1]
+        current_type = self._find_current_class(file_path, tree)
+        self._current_class_cache[normalized_path] = (tree, current_type)
+        return current_type
 
-                # 处理接口实现
-                if hasattr(declaration, 'implements'):
-                    if declaration.implements:
-                        type_info['interfaces'].extend(str(impl) for impl in declaration.implements)
+    def _find_current_class(self, file_path, tree):
+        """从语法树中找出文件的主类名（包括包名），即第一个顶层类型的限定名
 
-                self.class_cache[qualified_name] = type_info
-                self.logger.debug(f"找到类型: {qualified_name} ({type_info['kind']})")
+        Args:
+            file_path: 源文件路径
+            tree: 已解析的AST
+        """
+        try:
+            declarations = getattr(tree, 'types', None)
+            if not declarations:
+                self.logger.warning("在文件中未找到任何类型声明: %s", file_path)
+                return None
 
-                # 如果是顶层类型，返回其限定名
-                return qualified_name
+            # 获取包名（包声明只会出现在 CompilationUnit 上，无需遍历整棵树）
+            package_name = self._get_package_name(tree)
+            self.logger.debug("包名: %s", package_name)
 
-            self.logger.warning(f"在文件中未找到任何类型声明: {file_path}")
-            return None
+            type_name = declarations[0].name
+            return sys.intern(f"{package_name}.{type_name}" if package_name else type_name)
 
         except Exception as e:
             self.logger.error(f"获取当前类型名时出错 ({file_path}): {str(e)}")
@@ -1304,6 +2478,43 @@ class JavaASTExtractor:
             self.logger.error(traceback.format_exc())
             return None
 
+    def _index_types(self, file_path, tree):
+        """记录文件中顶层类型的继承信息到 class_cache
+
+        Args:
+            file_path: 源文件路径
+            tree: 已解析的AST
+        """
+        package_name = self._get_package_name(tree)
+        for declaration in getattr(tree, 'types', None) or ():
+            type_name = declaration.name
+            qualified_name = sys.intern(f"{package_name}.{type_name}" if package_name else type_name)
+
+            # 记录类型信息
+            type_info = {
+                'kind': type(declaration).__name__,
+                'modifiers': _modifier_set(declaration.modifiers or ()),
+                'superclass': None,
+                'interfaces': [],
+                'file_path': file_path
+            }
+
+            # 处理继承关系
+            if hasattr(declaration, 'extends'):
+                if declaration.extends:
+                    if isinstance(declaration.extends, list):
+                        type_info['interfaces'].extend(str(ext) for ext in declaration.extends)
+                    else:
+                        type_info['superclass'] = str(declaration.extends)
+
+            # 处理接口实现
+            if hasattr(declaration, 'implements'):
+                if declaration.implements:
+                    type_info['interfaces'].extend(str(impl) for impl in declaration.implements)
+
+            self.class_cache[qualified_name] = type_info
+            self.logger.debug("找到类型: %s (%s)", qualified_name, type_info['kind'])
+
     def _find_parent_method(self, path):
         """查找当前节点所在的方法声明
         
@@ -1318,14 +2529,10 @@ class JavaASTExtractor:
                 self.logger.warning("AST 路径为空，无法查找父方法")
                 return None
 
-            # 从路径中查找方法声明
+            # 从路径末尾向前查找最近的方法声明（或Lambda）
             for node in reversed(path):
-                if isinstance(node, javalang.tree.MethodDeclaration):
-                    return node
-                elif isinstance(node, javalang.tree.ConstructorDeclaration):
+                if type(node) in _METHOD_CONTEXT_TYPE_SET:
                     return node
-                elif isinstance(node, javalang.tree.LambdaExpression):
-                    return node  # Lambda 也可能是一个方法上下文
 
             self.logger.debug("未找到父方法声明")
             return None
@@ -1334,58 +2541,113 @@ class JavaASTExtractor:
             self.logger.error(f"查找父方法时出错: {str(e)}")
             return None
 
-    def analyze_project(self, src_root):
-        """分析项目源代码，构建调用图"""
+    def _call_cache_file(self):
+        """调用关系缓存文件路径"""
+        return os.path.join(self.output_dir, 'call_graph.pkl')
+
+    def _load_call_cache(self, src_root):
+        """
+        读取上次分析保存的按文件调用关系缓存。
+
+        Args:
+            src_root: 源代码根目录，与缓存记录的不一致时缓存作废
+
+        Returns:
+            dict: 相对路径 -> (修改时间, 文件大小, 补登记的调用者方法, 调用关系)；
+                未开启 use_disk_cache 时总是返回空字典
+        """
+        cache_file = self._call_cache_file()
+        if not self.use_disk_cache or not os.path.exists(cache_file):
+            return {}
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_root, entries = pickle.load(f)
+        except Exception as e:
+            self.logger.warning(f"读取调用关系缓存失败，将重新分析: {str(e)}")
+            return {}
+        if cached_root != os.path.abspath(src_root):
+            return {}
+        return entries
+
+    def _save_call_cache(self, src_root, entries):
+        """保存按文件调用关系缓存，供下次增量分析复用；未开启 use_disk_cache 时不保存"""
+        if not self.use_disk_cache:
+            return
+        try:
+            with open(self._call_cache_file(), 'wb') as f:
+                pickle.dump((os.path.abspath(src_root), entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.logger.warning(f"保存调用关系缓存失败: {str(e)}")
+
+    def analyze_project(self, src_root, changed_files=None, parallel=False):
+        """
+        分析项目源代码，构建调用图
+
+        Args:
+            src_root: 源代码根目录
+            changed_files: 可选，本次修改过的文件（如 parse_diff 的结果）。给出且开启了
+                use_disk_cache 时启用增量分析：未修改且修改时间、大小与缓存一致的文件直接复用
+                上次保存的调用关系，不再分析其中的方法调用
+            parallel: 是否使用进程池并行解析文件（进程数为 max_workers），默认False。
+                各文件的结果按文件顺序合并，与串行处理的结果一致；与 changed_files 同时给出时
+                按增量方式串行处理
+
+        Returns:
+            CallGraph: 构建好的调用图，出错时返回None
+        """
         try:
             self.logger.info(f"开始分析项目: {src_root}")
             self.src_root = src_root
             
-            # 获取所有Java文件
-            java_files = []
-            for root, _, files in os.walk(src_root):
-                for file in files:
-                    if file.endswith('.java'):
-                        rel_path = os.path.relpath(os.path.join(root, file), src_root)
-                        java_files.append(rel_path)
+            # 获取所有Java文件（已跳过 package-info 等无需解析的文件）
+            java_files = self._get_java_files()
             
             self.logger.info(f"找到 {len(java_files)} 个Java文件")
+
+            if parallel and changed_files is None:
+                # 每个文件在子进程中只解析一次，索引和调用关系由主进程合并
+                self._analyze_files_parallel(java_files)
+                self.logger.info(f"调用图构建完成，共有 {len(self.call_graph.edges)} 个方法的调用关系")
+                self._save_disk_cache_index()
+                return self.call_graph
             
             # 首先处理所有文件以建立method_index
             for file_path in java_files:
-                self.logger.debug(f"\n处理文件: {file_path}")
-                if 'package-info.java' in file_path:
-                    self.logger.debug(f"跳过package-info文件: {file_path}")
-                    continue
+                self.logger.debug("\n处理文件: %s", file_path)
                 self._process_file(file_path)
                 
             self.logger.info(f"method_index中共有 {len(self.method_index)} 个方法")
             
-            # 输出method_index的内容用于调试
-            self.logger.debug("\nmethod_index内容:")
-            for method_name, info in self.method_index.items():
-                self.logger.debug(f"  {method_name}: {info}")
+            # 输出method_index的内容用于调试（拼成一条日志输出）
+            if self.logger.isEnabledFor(logging.DEBUG):
+                lines = ["\nmethod_index内容:"]
+                lines.extend(f"  {method_name}: {info}" for method_name, info in self.method_index.items())
+                self.logger.debug('\n'.join(lines))
                 
             # 再次遍历处理方法调用
-            for file_path in java_files:
-                if 'package-info.java' in file_path:
-                    continue
-                self.logger.debug(f"\n处理文件的方法调用: {file_path}")
-                self._process_file_calls(file_path)
+            if changed_files is None:
+                for file_path in java_files:
+                    self.logger.debug("\n处理文件的方法调用: %s", file_path)
+                    self._process_file_calls(file_path)
+            else:
+                self._process_calls_incremental(src_root, java_files, changed_files)
                 
             # 输出调用图信息
             self.logger.info(f"调用图构建完成，共有 {len(self.call_graph.edges)} 个方法的调用关系")
+            self._save_disk_cache_index()
             
             # 输出一些调用关系示例
-            self.logger.debug("\n调用关系示例:")
-            count = 0
-            for method, calls in self.call_graph.edges.items():
-                if calls['callees']:
-                    self.logger.debug(f"  {method} 调用了:")
-                    for callee in calls['callees']:
-                        self.logger.debug(f"    -> {callee}")
-                    count += 1
-                    if count >= 5:  # 只显示前5个有调用的方法
-                        break
+            if self.logger.isEnabledFor(logging.DEBUG):
+                lines = ["\n调用关系示例:"]
+                count = 0
+                for method, calls in self.call_graph.edges.items():
+                    if calls['callees']:
+                        lines.append(f"  {method} 调用了:")
+                        lines.extend(f"    -> {callee}" for callee in calls['callees'])
+                        count += 1
+                        if count >= 5:  # 只显示前5个有调用的方法
+                            break
+                self.logger.debug('\n'.join(lines))
                     
             return self.call_graph
             
@@ -1395,13 +2657,60 @@ class JavaASTExtractor:
             self.logger.error(traceback.format_exc())
             return None
 
+    def _process_calls_incremental(self, src_root, java_files, changed_files):
+        """
+        增量处理方法调用：只分析修改过的文件，其余文件复用缓存的调用关系。
+        缓存只在开启 use_disk_cache 时读写，否则所有文件都会重新分析。
+
+        调用关系的解析只依赖本文件的导入、字段和局部变量信息，因此文件本身没有
+        变化时，上次得到的调用关系仍然有效。
+
+        Args:
+            src_root: 源代码根目录
+            java_files: 项目中所有Java文件的相对路径
+            changed_files: 本次修改过的文件路径
+        """
+        changed = {os.path.normpath(f) for f in changed_files}
+        cache = self._load_call_cache(src_root)
+        new_cache = {}
+        method_index = self.method_index
+        reused = 0
+
+        for file_path in java_files:
+            normalized_path = os.path.normpath(file_path)
+            try:
+                stat = os.stat(self._full_path(normalized_path))
+                file_key = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                file_key = None
+
+            entry = cache.get(normalized_path)
+            if (entry is not None and file_key is not None and normalized_path not in changed
+                    and entry[:2] == file_key):
+                new_methods, file_calls = entry[2], entry[3]
+                new_methods = [(name, info) for name, info in new_methods if name not in method_index]
+                method_index.update(new_methods)
+                self.call_graph.add_methods(new_methods)
+                self.call_graph.add_calls(_intern_calls(file_calls))
+                new_cache[normalized_path] = entry
+                reused += 1
+                continue
+
+            self.logger.debug("\n处理文件的方法调用: %s", file_path)
+            result = self._process_file_calls(file_path)
+            if result is not None and file_key is not None:
+                new_cache[normalized_path] = file_key + result
+
+        self.logger.info(f"增量分析：{reused} 个文件复用了缓存的调用关系")
+        self._save_call_cache(src_root, new_cache)
+
     def _resolve_type_name(self, type_node, imports, package_name):
         """解析完整的类型名称"""
         try:
             self.logger.debug("\n=== 解析类型名称 ===")
-            self.logger.debug(f"输入类型: {type_node}")
-            self.logger.debug(f"导入信息: {imports}")
-            self.logger.debug(f"包名: {package_name}")
+            self.logger.debug("输入类型: %s", type_node)
+            self.logger.debug("导入信息: %s", imports)
+            self.logger.debug("包名: %s", package_name)
             
             if isinstance(type_node, str):
                 type_name = type_node
@@ -1427,11 +2736,11 @@ class JavaASTExtractor:
                     
                 # 4. java.lang包中的类
                 if type_name in {'String', 'Object', 'Integer', 'Boolean', 'Double', 'Float', 'Exception', 'RuntimeException'}:
-                    return f"java.lang.{type_name}"
+                    return sys.intern(f"java.lang.{type_name}")
                     
                 # 5. 同包类型
                 if package_name:
-                    return f"{package_name}.{type_name}"
+                    return sys.intern(f"{package_name}.{type_name}")
                     
                 return type_name
                 
@@ -1444,7 +2753,7 @@ class JavaASTExtractor:
                 base_type = self._resolve_type_name(type_node.name, imports, package_name)
                 # 处理数组维度
                 array_dims = '[]' * len(type_node.dimensions) if hasattr(type_node, 'dimensions') else ''
-                return base_type + array_dims
+                return sys.intern(base_type + array_dims)
                 
             return str(type_node)
             
@@ -1456,7 +2765,7 @@ class JavaASTExtractor:
         """查找当前路径中的类声明节点"""
         try:
             for node in reversed(path):
-                if isinstance(node, (javalang.tree.ClassDeclaration, javalang.tree.InterfaceDeclaration)):
+                if type(node) in _CLASS_CONTEXT_TYPE_SET:
                     return node
                 
             self.logger.warning("在路径中未找到类或接口声明")
@@ -1466,11 +2775,12 @@ class JavaASTExtractor:
             self.logger.error(f"查找父类时出错: {str(e)}")
             return None
 
-    def _get_field_types(self, tree):
+    def _get_field_types(self, tree, field_nodes=None):
         """获取类中所有字段的类型信息
         
         Args:
             tree: Java AST树
+            field_nodes: 可选，调用方遍历语法树时已收集的字段声明，不给出时在这里遍历一次
             
         Returns:
             dict: 字段名到类型的映射，如 {'name': 'java.lang.String'}
@@ -1481,7 +2791,9 @@ class JavaASTExtractor:
             package_name = self._get_package_name(tree)
             
             # 遍历所有字段声明
-            for path, field_decl in tree.filter(javalang.tree.FieldDeclaration):
+            if field_nodes is None:
+                field_nodes = _collect_declarations(tree).fields
+            for field_decl in field_nodes:
                 # 获取字段类型
                 field_type = self._resolve_type_name(field_decl.type, imports, package_name)
                 
@@ -1501,7 +2813,7 @@ class JavaASTExtractor:
                                 resolved_type = self._resolve_type_name(creator_type, imports, package_name)
                                 field_types[field_name] = resolved_type
                 
-                    self.logger.debug(f"添加字段类型: {field_name} -> {field_types[field_name]}")
+                    self.logger.debug("添加字段类型: %s -> %s", field_name, field_types[field_name])
             
             return field_types
             
@@ -1522,13 +2834,10 @@ class JavaASTExtractor:
         """
         imports = {}
         
-        # 处理导入声明
-        for _, node in tree.filter(javalang.tree.Import):
+        # 处理导入声明（导入只会出现在 CompilationUnit.imports 中）
+        for node in getattr(tree, 'imports', None) or ():
             if node.path:
-                if isinstance(node.path, list):
-                    import_path = '.'.join(str(p.value) if hasattr(p, 'value') else str(p) for p in node.path)
-                else:
-                    import_path = str(node.path)
+                import_path = _path_to_str(node.path)
                 
                 # 处理静态导入和普通导入
                 if node.static:
@@ -1557,9 +2866,7 @@ class JavaASTExtractor:
         Returns:
             str: 包名，如果没有则返回None
         """
-        for _, node in tree.filter(javalang.tree.PackageDeclaration):
-            if isinstance(node.name, list):
-                return '.'.join(str(n.value) for n in node.name if hasattr(n, 'value'))
-            else:
-                return str(node.name)
+        package = getattr(tree, 'package', None)
+        if package is not None:
+            return sys.intern(_path_to_str(package.name))
         return None
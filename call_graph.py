@@ -5,50 +5,130 @@ import os
 import logging
 from concurrent.futures import ProcessPoolExecutor
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+# 标准库包前缀，使用元组以便直接传给 str.startswith
+EXCLUDE_PREFIXES = (
+    'java.',
+    'javax.',
+    'sun.',
+    'com.sun.',
+    'org.w3c.',
+    'org.xml.',
+    'org.ietf.',
+    'org.omg.',
+    'org.jcp.',
+    'android.',
+)
+
+# 常见的Java标准库类型
+_COMMON_JAVA_TYPES = frozenset({
+    # 基础类型
+    'Object', 'String', 'Integer', 'Long', 'Double', 'Float', 'Boolean', 'Byte', 'Short', 'Character',
+
+    # 异常类型
+    'Exception', 'RuntimeException', 'IllegalArgumentException', 'NullPointerException',
+    'IllegalStateException', 'UnsupportedOperationException', 'IndexOutOfBoundsException',
+    'NoSuchElementException', 'ClassCastException', 'ArrayIndexOutOfBoundsException',
+
+    # 集合类型
+    'List', 'ArrayList', 'LinkedList', 'Set', 'HashSet', 'Map', 'HashMap', 'TreeMap',
+    'Collection', 'Collections', 'Arrays', 'Iterator', 'Iterable',
+
+    # 其他常用类型
+    'StringBuilder', 'StringBuffer', 'Math', 'System', 'Class', 'Thread', 'Runnable',
+    'Optional', 'Stream', 'Collectors', 'Objects', 'PrintStream', 'PrintWriter',
+    'Console', 'Scanner', 'Random', 'Date', 'Calendar', 'TimeZone'
+})
+
+# 标准库方法调用模式
+_STANDARD_METHOD_PATTERNS = (
+    'System.out', 'System.err', 'System.in',
+    'System.currentTimeMillis', 'System.nanoTime',
+    'System.arraycopy', 'System.getProperty',
+    'System.setProperty', 'System.getenv'
+)
+
+
+def _is_standard_library_call(method_name):
+    """检查是否是标准库方法调用"""
+    # 检查完整的方法调用模式
+    if method_name.startswith(_STANDARD_METHOD_PATTERNS):
+        return True
+    # 检查类型名称
+    return method_name.rsplit('.', 1)[-1] in _COMMON_JAVA_TYPES
+
+
 class CallGraph:
     """表示方法调用关系图的类"""
 
     def __init__(self):
         self.nodes = {}  # 存储所有方法节点
+        self.methods_by_class = {}  # 类名 -> 该类中方法的完整限定名集合
         self.edges = {}  # 存储调用关系
         self.logger = logging.getLogger('CallGraph')
         self.logger.setLevel(logging.DEBUG)
 
     def add_method(self, qualified_name, method_info):
         """添加方法节点"""
-        try:
-            self.logger.debug(f"添加方法: {qualified_name}")
-            self.logger.debug(f"方法信息: {method_info}")
-            
-            # 将 modifiers 集合转换为列表
-            modifiers = list(method_info.get('modifiers', set())) if isinstance(method_info.get('modifiers'), set) else method_info.get('modifiers', [])
-            
-            # 确保获取 signature
-            signature = method_info.get('signature')
-            if not signature:  # 如果 signature 为空，尝试构建一个基本的签名
-                signature = f"{' '.join(modifiers)} {method_info['name']}()"
-            
-            self.nodes[qualified_name] = {
-                'name': method_info['name'],
-                'qualified_name': qualified_name,
-                'file_path': method_info['file_path'],
-                'class_name': method_info['class_name'],
-                'start_line': method_info.get('start_line'),
-                'end_line': method_info.get('end_line'),
-                'type': method_info['type'],
-                'modifiers': modifiers,
-                'signature': signature,  # 使用获取到的或构建的签名
-                'source_code': method_info.get('source_code')  # 添加源代码字段
-            }
-            # 确保方法在 edges 中有一个入口
-            if qualified_name not in self.edges:
-                self.edges[qualified_name] = {
-                    'callers': set(),  # 调用此方法的方法
-                    'callees': set()   # 此方法调用的方法
+        self.add_methods(((qualified_name, method_info),))
+
+    def add_methods(self, methods):
+        """批量添加方法节点，节点内容与 add_method 相同
+        
+        Args:
+            methods: (完整限定名, 方法信息) 元组的可迭代对象
+        """
+        nodes = self.nodes
+        edges = self.edges
+        methods_by_class = self.methods_by_class
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        for qualified_name, method_info in methods:
+            try:
+                if debug:
+                    self.logger.debug("添加方法: %s\n方法信息: %s", qualified_name, method_info)
+                
+                # 将 modifiers 集合转换为列表
+                modifiers = method_info.get('modifiers')
+                if isinstance(modifiers, (set, frozenset)):
+                    modifiers = list(modifiers)
+                elif modifiers is None:
+                    modifiers = []
+                
+                # 确保获取 signature
+                signature = method_info.get('signature')
+                if not signature:  # 如果 signature 为空，尝试构建一个基本的签名
+                    signature = f"{' '.join(modifiers)} {method_info['name']}()"
+                
+                nodes[qualified_name] = {
+                    'name': method_info['name'],
+                    'qualified_name': qualified_name,
+                    'file_path': method_info['file_path'],
+                    'class_name': method_info['class_name'],
+                    'start_line': method_info.get('start_line'),
+                    'end_line': method_info.get('end_line'),
+                    'type': method_info['type'],
+                    'modifiers': modifiers,
+                    'signature': signature,  # 使用获取到的或构建的签名
+                    'source_code': method_info.get('source_code')  # 添加源代码字段
                 }
-            self.logger.debug(f"当前已索引方法数: {len(self.nodes)}")
-        except Exception as e:
-            self.logger.error(f"添加方法时出错 {qualified_name}: {str(e)}")
+                class_methods = methods_by_class.get(method_info['class_name'])
+                if class_methods is None:
+                    class_methods = methods_by_class[method_info['class_name']] = set()
+                class_methods.add(qualified_name)
+                # 确保方法在 edges 中有一个入口
+                if qualified_name not in edges:
+                    edges[qualified_name] = {
+                        'callers': set(),  # 调用此方法的方法
+                        'callees': set()   # 此方法调用的方法
+                    }
+            except Exception as e:
+                self.logger.error(f"添加方法时出错 {qualified_name}: {str(e)}")
+        if debug:
+            self.logger.debug("当前已索引方法数: %s", len(nodes))
 
     def add_call(self, caller, callee):
         """添加方法调用关系
@@ -57,86 +137,47 @@ class CallGraph:
             caller: 调用方法的完整限定名
             callee: 被调用方法的完整限定名
         """
-        try:
-            # 检查是否是标准库调用
-            exclude_prefixes = {
-                'java.',
-                'javax.',
-                'sun.',
-                'com.sun.',
-                'org.w3c.',
-                'org.xml.',
-                'org.ietf.',
-                'org.omg.',
-                'org.jcp.',
-                'android.',
-            }
-            
-            # 如果调用者或被调用者是标准库方法，则跳过
-            if any(caller.startswith(prefix) for prefix in exclude_prefixes) or \
-               any(callee.startswith(prefix) for prefix in exclude_prefixes):
-                return
-            
-            # 定义常见的Java标准库类型和方法
-            common_java_types = {
-                # 基础类型
-                'Object', 'String', 'Integer', 'Long', 'Double', 'Float', 'Boolean', 'Byte', 'Short', 'Character',
+        self.add_calls(((caller, callee),))
+
+    def add_calls(self, calls):
+        """批量添加方法调用关系，过滤规则与 add_call 相同
+        
+        Args:
+            calls: (调用者, 被调用者) 完整限定名元组的可迭代对象
+        """
+        edges = self.edges
+        for caller, callee in calls:
+            try:
+                # 如果调用者或被调用者是标准库方法，则跳过
+                if caller.startswith(EXCLUDE_PREFIXES) or callee.startswith(EXCLUDE_PREFIXES):
+                    continue
+
+                # 如果调用者或被调用者是Java标准库类型或标准库方法，则跳过
+                if _is_standard_library_call(caller) or _is_standard_library_call(callee):
+                    continue
                 
-                # 异常类型
-                'Exception', 'RuntimeException', 'IllegalArgumentException', 'NullPointerException',
-                'IllegalStateException', 'UnsupportedOperationException', 'IndexOutOfBoundsException',
-                'NoSuchElementException', 'ClassCastException', 'ArrayIndexOutOfBoundsException',
+                # 初始化调用者节点
+                caller_edge = edges.get(caller)
+                if caller_edge is None:
+                    caller_edge = edges[caller] = {
+                        'callers': set(),  # 调用这个方法的方法集合
+                        'callees': set()   # 这个方法调用的其他方法集合
+                    }
                 
-                # 集合类型
-                'List', 'ArrayList', 'LinkedList', 'Set', 'HashSet', 'Map', 'HashMap', 'TreeMap',
-                'Collection', 'Collections', 'Arrays', 'Iterator', 'Iterable',
+                # 初始化被调用者节点
+                callee_edge = edges.get(callee)
+                if callee_edge is None:
+                    callee_edge = edges[callee] = {
+                        'callers': set(),
+                        'callees': set()
+                    }
                 
-                # 其他常用类型
-                'StringBuilder', 'StringBuffer', 'Math', 'System', 'Class', 'Thread', 'Runnable',
-                'Optional', 'Stream', 'Collectors', 'Objects', 'PrintStream', 'PrintWriter',
-                'Console', 'Scanner', 'Random', 'Date', 'Calendar', 'TimeZone'
-            }
-
-            # 定义标准库方法调用模式
-            standard_method_patterns = {
-                'System.out', 'System.err', 'System.in',
-                'System.currentTimeMillis', 'System.nanoTime',
-                'System.arraycopy', 'System.getProperty',
-                'System.setProperty', 'System.getenv'
-            }
-
-            # 检查是否是标准库方法调用
-            def is_standard_library_call(method_name):
-                # 检查完整的方法调用模式
-                if any(method_name.startswith(pattern) for pattern in standard_method_patterns):
-                    return True
-                # 检查类型名称
-                return method_name.split('.')[-1] in common_java_types
-
-            # 如果调用者或被调用者是Java标准库类型或标准库方法，则跳过
-            if is_standard_library_call(caller) or is_standard_library_call(callee):
-                return
-            
-            # 初始化调用者节点
-            if caller not in self.edges:
-                self.edges[caller] = {
-                    'callers': set(),  # 调用这个方法的方法集合
-                    'callees': set()   # 这个方法调用的其他方法集合
-                }
-            
-            # 初始化被调用者节点
-            if callee not in self.edges:
-                self.edges[callee] = {
-                    'callers': set(),
-                    'callees': set()
-                }
-            
-            # 添加调用关系
-            self.edges[caller]['callees'].add(callee)
-            self.edges[callee]['callers'].add(caller)
-            
-        except Exception as e:
-            print(f"添加调用关系时出错: {str(e)}")
+                # 添加调用关系
+                caller_edge['callees'].add(callee)
+                callee_edge['callers'].add(caller)
+                
+            except Exception as e:
+                self.logger.error(f"添加调用关系时出错: {str(e)}")
 
     def _is_valid_method_name(self, method_name):
         """验证方法名格式是否有效
@@ -198,33 +239,30 @@ class CallGraph:
         try:
             self.logger.info("开始保存调用图...")
             self.logger.info(f"总方法数: {len(self.nodes)}")
-            self.logger.info(f"总调用关系数: {sum(len(e['callees']) for e in self.edges.values())}")
-            
-            # 将所有的 set 转换为 list
-            serializable_edges = {}
-            for method, calls in self.edges.items():
-                serializable_edges[method] = {
-                    'callers': list(calls['callers']),
-                    'callees': list(calls['callees'])
-                }
+            total_calls = sum(len(e['callees']) for e in self.edges.values())
+            self.logger.info(f"总调用关系数: {total_calls}")
 
-            # 准备要保存的数据
+            # 准备要保存的数据，edges 中的 set 在序列化时直接转换为 list
             data = {
                 'metadata': {
                     'total_methods': len(self.nodes),
-                    'total_calls': sum(len(e['callees']) for e in self.edges.values()),
+                    'total_calls': total_calls,
                     'generated_time': datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 },
                 'methods': self.nodes,
-                'call_hierarchy': serializable_edges
+                'call_hierarchy': self.edges
             }
 
             # 创建输出目录（如果不存在）
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-            # 保存为JSON
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # 保存为JSON，优先使用 orjson
+            if orjson is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(data, default=list, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False, default=list)
             
             self.logger.info(f"调用图已保存到: {output_file}")
         except Exception as e:
@@ -252,10 +290,18 @@ class CallGraph:
 
     def load(self, file_path):
         """从文件加载调用图"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # 与 save 对应，优先使用 orjson 解析
+        if orjson is not None:
+            with open(file_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
             
         self.nodes = data['methods']
+        self.methods_by_class = {}
+        for qualified_name, node in self.nodes.items():
+            self.methods_by_class.setdefault(node['class_name'], set()).add(qualified_name)
         # 将列表转换回集合
         self.edges = {
             method: {
@@ -22,6 +22,13 @@ def setup_logger():
     
     return logger
 
+def non_negative_int(value):
+    """argparse 参数类型：不小于0的整数"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"必须是不小于0的整数: {value}")
+    return number
+
 def main():
     # 解析命令行参数
     parser = argparse.ArgumentParser(description='生成Java项目的函数调用图')
@@ -31,6 +38,8 @@ def main():
                        help='输出目录路径 (默认: analysis_results)')
     parser.add_argument('--debug', action='store_true', 
                        help='启用调试模式')
+    parser.add_argument('--jobs', type=non_negative_int, default=1,
+                       help='并行解析文件的进程数，0表示使用CPU核数 (默认: 1，串行处理)')
     args = parser.parse_args()
 
     # 设置日志
@@ -44,12 +53,13 @@ def main():
 
     try:
         # 创建AST提取器并传递日志配置
-        ast_extractor = JavaASTExtractor(logger)
+        ast_extractor = JavaASTExtractor(logger, max_workers=args.jobs or None)
         ast_extractor.debug_mode = args.debug
         
-        # 分析项目并构建调用图
+        # 分析项目并构建调用图（多于一个进程时由进程池并行解析文件）
         logger.info("开始分析项目...")
-        call_graph = ast_extractor.analyze_project(args.src_dir)
+        call_graph = ast_extractor.analyze_project(args.src_dir,
+                                                   parallel=ast_extractor.max_workers > 1)
         
         if not call_graph:
             logger.error("调用图构建失败")
@@ -75,11 +85,11 @@ def main():
             # 输出一些调试信息
             logger.debug("检查前10个方法的信息:")
             for method_name in list(call_graph.nodes.keys())[:10]:
-                logger.debug(f"方法: {method_name}")
-                logger.debug(f"  - 信息: {call_graph.nodes[method_name]}")
+                logger.debug("方法: %s", method_name)
+                logger.debug("  - 信息: %s", call_graph.nodes[method_name])
                 if method_name in call_graph.edges:
-                    logger.debug(f"  - 调用者: {call_graph.edges[method_name]['callers']}")
-                    logger.debug(f"  - 被调用: {call_graph.edges[method_name]['callees']}")
+                    logger.debug("  - 调用者: %s", call_graph.edges[method_name]['callers'])
+                    logger.debug("  - 被调用: %s", call_graph.edges[method_name]['callees'])
         
         # 保存调用图到文件
         logger.info("保存调用图...")
@@ -7,6 +7,11 @@ import argparse
 import sys
 from ast_extractor import JavaASTExtractor
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
 class JavaChangeAnalyzer:
     """Java代码修改分析器，用于分析多个Java文件的修改"""
 
@@ -121,8 +126,14 @@ class JavaChangeAnalyzer:
                 "file_analyses": analysis_results
             }
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, indent=2, ensure_ascii=False)
+            # 优先使用 orjson 序列化
+            if orjson is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(result_data, default=list,
+                                         option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(result_data, f, indent=2, ensure_ascii=False, default=list)
             
             self.logger.info(f"\n所有分析结果已保存到: {output_file}")
             return output_file
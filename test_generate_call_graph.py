@@ -0,0 +1,96 @@
+# tests/test_generate_call_graph.py
+import unittest
+import os
+import sys
+import json
+import logging
+from unittest import mock
+import generate_call_graph
+from ast_extractor import JavaASTExtractor
+from test_method_index import JavaProjectTestCase
+
+class TestJobsOption(JavaProjectTestCase):
+    """测试 generate_call_graph.py 的 --jobs 参数"""
+
+    SOURCES = {
+        'com/ex/A.java': """package com.ex;
+
+public class A {
+    private B b = new B();
+
+    public void run() {
+        b.foo();
+        b.bar();
+    }
+}""",
+        'com/ex/B.java': """package com.ex;
+
+public class B {
+    public void foo() {
+        bar();
+    }
+
+    public void bar() {
+    }
+}""",
+    }
+
+    def _run_main(self, *args):
+        """以给定的命令行参数运行 main()"""
+        with mock.patch.object(sys, 'argv', ['generate_call_graph.py', '--src-dir', self.src_root, *args]):
+            return generate_call_graph.main()
+
+    def _load(self, output_file):
+        """读取保存的调用图，忽略生成时间和调用关系的顺序"""
+        with open(output_file, encoding='utf-8') as f:
+            data = json.load(f)
+        del data['metadata']['generated_time']
+        for edge in data['call_hierarchy'].values():
+            edge['callers'] = sorted(edge['callers'])
+            edge['callees'] = sorted(edge['callees'])
+        return data
+
+    def test_jobs_match_serial(self):
+        """测试 --jobs 1 与 --jobs 2 的输出都与串行分析一致"""
+        extractor = JavaASTExtractor(logger=self.logger, max_workers=1)
+        extractor.analyze_project(self.src_root).save(os.path.join('serial', 'call_graph.json'))
+        expected = self._load(os.path.join('serial', 'call_graph.json'))
+        self.assertIn('com.ex.B.bar', expected['call_hierarchy']['com.ex.A.run']['callees'])
+
+        for jobs in ('1', '2'):
+            output_dir = f'jobs{jobs}'
+            self.assertEqual(self._run_main('--jobs', jobs, '--output-dir', output_dir), 0)
+            self.assertEqual(self._load(os.path.join(output_dir, 'call_graph.json')), expected)
+
+    def test_jobs_selects_parallel(self):
+        """测试 --jobs 0 使用CPU核数，且只有多于一个进程时才并行分析"""
+        for jobs, cpu_count, max_workers, parallel in (('0', 4, 4, True), ('0', 1, 1, False),
+                                                       ('1', 4, 1, False), ('3', 1, 3, True)):
+            calls = []
+
+            def analyze_project(extractor, src_root, changed_files=None, parallel=False):
+                calls.append((extractor.max_workers, parallel))
+                return None
+
+            with mock.patch.object(os, 'cpu_count', return_value=cpu_count), \
+                    mock.patch.object(JavaASTExtractor, 'analyze_project', analyze_project):
+                # analyze_project 返回 None 时 main() 按构建失败处理
+                self.assertEqual(self._run_main('--jobs', jobs), 1)
+            self.assertEqual(calls, [(max_workers, parallel)])
+
+    def test_negative_jobs_rejected(self):
+        """测试 --jobs 为负数时直接报错退出，不会静默改为串行"""
+        with mock.patch.object(JavaASTExtractor, 'analyze_project') as analyze_project, \
+                mock.patch.object(sys, 'stderr'):
+            with self.assertRaises(SystemExit) as context:
+                self._run_main('--jobs', '-3')
+        self.assertEqual(context.exception.code, 2)
+        analyze_project.assert_not_called()
+
+    def tearDown(self):
+        """清理临时目录和 main() 添加的日志处理器"""
+        super().tearDown()
+        logging.getLogger('CallGraphGenerator').handlers.clear()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,11 @@
 import unittest
 import os
 import logging
-from ast_extractor import JavaASTExtractor
+import shutil
+import tempfile
+from unittest import mock
+import javalang
+from ast_extractor import JavaASTExtractor, _end_line_by_braces, _ranges_touching_lines, scan_header
 
 class TestMethodIndex(unittest.TestCase):
     """测试方法索引功能"""
@@ -134,7 +138,6 @@ public abstract class AbstractProcessor {
 
     def tearDown(self):
         """清理测试文件"""
-        import shutil
         if os.path.exists(self.test_project_path):
             shutil.rmtree(self.test_project_path)
         
@@ -142,5 +145,469 @@ public abstract class AbstractProcessor {
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
 
+
+class JavaProjectTestCase(unittest.TestCase):
+    """在临时目录中准备Java源码的测试基类
+
+    分析结果（analysis_results）输出到当前目录，测试期间切换到临时目录，避免影响工作区。
+    """
+
+    SRC_DIR = 'src'  # 源代码根目录，相对临时目录
+    SOURCES = {}  # 相对源代码根目录的路径 -> 源码，setUp 时写入
+
+    def setUp(self):
+        """创建临时目录并写入 SOURCES 中的源文件"""
+        self.work_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        self.src_root = os.path.join(self.work_dir, self.SRC_DIR)
+        os.makedirs(self.src_root)
+        for rel_path, source in self.SOURCES.items():
+            self.write_source(rel_path, source)
+        self.logger = logging.getLogger(type(self).__name__)
+
+    def write_source(self, rel_path, source):
+        """写入源代码根目录下的文件，rel_path 使用正斜杠分隔"""
+        full_path = os.path.join(self.src_root, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w') as f:
+            f.write(source)
+
+    def tearDown(self):
+        """回到原来的工作目录并删除临时目录"""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.work_dir)
+
+
+class TestIndexMerge(JavaProjectTestCase):
+    """测试逐个文件的分析结果合并到方法索引"""
+
+    # 两个文件中各有一个同名的嵌套类，其中的同名方法在索引中的名称会冲突
+    OUTER_CLASS = """package com.ex;
+
+public class {outer} {{
+    public static class Builder {{
+        public Object build(String value) {{
+            return value;
+        }}
+    }}
+}}"""
+
+    SOURCES = {
+        'com/ex/A.java': OUTER_CLASS.format(outer='A'),
+        'com/ex/B.java': OUTER_CLASS.format(outer='B'),
+    }
+
+    def _build(self, **kwargs):
+        """建立项目索引并返回分析器"""
+        extractor = JavaASTExtractor(logger=self.logger, **kwargs)
+        extractor.src_root = self.src_root
+        extractor.build_project_index()
+        return extractor
+
+    @staticmethod
+    def _summary(extractor):
+        """索引名称 -> (所在文件, 开始行, 条目中记录的名称)"""
+        return {name: (info.get('file_path'), info.get('start_line'), info.get('qualified_name'))
+                for name, info in extractor.method_index.items()}
+
+    def test_overloads_across_files(self):
+        """测试不同文件中同名方法的重载命名与串行建立索引一致"""
+        serial = self._build(max_workers=1, use_disk_cache=False)
+        self.assertIn('com.ex.Builder.build', serial.method_index)
+        self.assertIn('com.ex.Builder.build(String)', serial.method_index)
+
+        parallel = self._build(max_workers=2, use_disk_cache=False)
+        self.assertEqual(self._summary(parallel), self._summary(serial))
+        self.assertEqual(set(parallel.call_graph.nodes), set(serial.call_graph.nodes))
+
+    def test_default_is_serial(self):
+        """测试默认参数下即使有多个CPU核，建立索引也不启动进程池"""
+        with mock.patch.object(os, 'cpu_count', return_value=4), \
+                mock.patch('ast_extractor.ProcessPoolExecutor', side_effect=AssertionError('进程池')):
+            extractor = self._build()
+        self.assertEqual(extractor.max_workers, 1)
+        self.assertEqual(self._summary(extractor), self._summary(self._build(max_workers=1)))
+
+    def test_snapshot_reload(self):
+        """测试从分析结果快照重新加载得到的方法索引与串行建立索引一致"""
+        serial = self._build(max_workers=1, use_disk_cache=False)
+        self._build(max_workers=1, use_disk_cache=True)
+
+        with self.assertLogs(self.logger, level='INFO') as logs:
+            reloaded = self._build(max_workers=1, use_disk_cache=True)
+        self.assertTrue(any('2 个文件内容未变化' in message for message in logs.output))
+        self.assertEqual(self._summary(reloaded), self._summary(serial))
+        self.assertEqual(reloaded.call_graph.edges, serial.call_graph.edges)
+
+    def test_parallel_disk_cache_index(self):
+        """测试并行分析时子进程计算的源码哈希会写入AST缓存索引"""
+        extractor = JavaASTExtractor(logger=self.logger, max_workers=2, use_disk_cache=True)
+        extractor.analyze_project(self.src_root, parallel=True)
+
+        index = JavaASTExtractor(logger=self.logger, use_disk_cache=True)._get_disk_cache_index()
+        for outer in ('A', 'B'):
+            self.assertIn(os.path.join(self.src_root, 'com', 'ex', f'{outer}.java'), index)
+
+
+class TestJavaFileDiscovery(JavaProjectTestCase):
+    """测试查找项目中的Java文件"""
+
+    # 临时目录下的 proj 作为项目目录，各测试以其中不同的子目录作为 src_root
+    SRC_DIR = 'proj'
+    SOURCES = {rel_path: 'package p;\n\nclass C {}\n'
+               for rel_path in ('src/main/java/com/ex/A.java',
+                                'src/main/java/com/ex/build/B.java',
+                                'src/main/java/java/util/Fake.java',
+                                'target/generated/G.java')}
+
+    def _java_files(self, src_root):
+        """返回项目目录下 src_root 中找到的Java文件（相对路径）"""
+        extractor = JavaASTExtractor(logger=self.logger, max_workers=1, use_disk_cache=False)
+        extractor.src_root = os.path.join(self.src_root, src_root)
+        return set(extractor._get_java_files())
+
+    def test_stdlib_files_under_source_root(self):
+        """测试能识别源码目录时跳过标准库包下的文件"""
+        self.assertEqual(self._java_files('src'),
+                         {'main/java/com/ex/A.java', 'main/java/com/ex/build/B.java'})
+
+    def test_src_root_inside_source_root(self):
+        """测试 src_root 指向 src/main 等中间目录时不会把所有文件当作标准库文件"""
+        self.assertEqual(self._java_files('src/main'),
+                         {'java/com/ex/A.java', 'java/com/ex/build/B.java', 'java/java/util/Fake.java'})
+        self.assertEqual(self._java_files('src/main/java'),
+                         {'com/ex/A.java', 'com/ex/build/B.java', 'java/util/Fake.java'})
+
+    def test_skipped_dirs_only_under_src_root(self):
+        """测试只跳过 src_root 下直接的构建输出目录，同名的Java包目录照常查找"""
+        self.assertEqual(self._java_files(''),
+                         {'src/main/java/com/ex/A.java', 'src/main/java/com/ex/build/B.java'})
+
+
+class TestMethodEndLine(JavaProjectTestCase):
+    """测试方法结束行号的计算"""
+
+    SOURCE = """package com.ex;
+
+public class A {
+    @Deprecated
+    public String text() {
+        String open = "{ \\" {";
+        char close = '}';
+        // }
+        /* } {
+           } */
+        return open + close;
+    }
+
+    @SuppressWarnings(value = {"a", "b"})
+    public void empty() { }
+
+    public abstract void todo();
+}"""
+
+    SOURCES = {'com/ex/A.java': SOURCE}
+
+    def setUp(self):
+        """测试前的准备工作"""
+        super().setUp()
+        self.source_lines = self.SOURCE.splitlines(keepends=True)
+
+    def test_braces_in_literals_and_comments(self):
+        """测试字符串、字符字面量、注释和注解参数中的花括号不计入"""
+        self.assertEqual(_end_line_by_braces(self.source_lines, 5), 12)
+        self.assertEqual(_end_line_by_braces(self.source_lines, 14), 15)
+        self.assertIsNone(_end_line_by_braces(self.source_lines, 17))
+
+    def test_index_matches_affected_methods(self):
+        """测试 method_index 中的结束行与查找受影响方法时的范围一致"""
+        extractor = JavaASTExtractor(logger=self.logger, max_workers=1, use_disk_cache=False)
+        extractor.analyze_project(self.src_root)
+        _, method_line_map = extractor.find_methods_by_lines(os.path.join('com', 'ex', 'A.java'), [6])
+
+        text = extractor.method_index['com.ex.A.text']
+        self.assertEqual((text.start_line, text.end_line), (5, 12))
+        self.assertTrue(text.source_code.rstrip().endswith('}'))
+        for name in ('text', 'empty', 'todo'):
+            info = extractor.method_index[f'com.ex.A.{name}']
+            self.assertEqual(method_line_map[f'com.ex.A.{name}'],
+                             {'start_line': info.start_line, 'end_line': info.end_line})
+
+
+class TestScanHeader(unittest.TestCase):
+    """测试 javalang 解析失败时使用的头部扫描"""
+
+    SOURCE = """/*
+ * package com.wrong;
+ * import com.wrong.Foo;
+ */
+// class Commented {
+package com.ex;
+
+import static java.util.Collections.emptyList;
+import static java.util.Arrays.*;
+import java.util.List;
+
+@Target({ElementType.TYPE})
+@Meta(type = String.class, name = "class Fake {")
+public @interface Marker {
+    String value() default "}";
+}
+
+@Deprecated
+class Second {
+    class Inner { }
+    char c = '{';
+}
+"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.logger = logging.getLogger('TestScanHeader')
+
+    def test_comments_before_package(self):
+        """测试 package 之前注释中的包名和导入不被识别"""
+        header = scan_header(self.SOURCE)
+        self.assertEqual(header.package, 'com.ex')
+        self.assertNotIn(('com.wrong.Foo', False), header.imports)
+
+    def test_static_imports(self):
+        """测试静态导入和通配符导入"""
+        self.assertEqual(scan_header(self.SOURCE).imports, [
+            ('java.util.Collections.emptyList', True),
+            ('java.util.Arrays.*', True),
+            ('java.util.List', False),
+        ])
+
+    def test_annotations(self):
+        """测试注解参数中的 .class、字符串和花括号不影响顶层类型及其行号范围"""
+        self.assertEqual(scan_header(self.SOURCE).types, [
+            ('annotation', 'Marker', 14, 16),
+            ('class', 'Second', 19, 22),
+        ])
+        header = scan_header('@Deprecated\npackage com.ex;\n')
+        self.assertEqual((header.package, header.types), ('com.ex', []))
+
+    def test_parse_fallback(self):
+        """测试 javalang 无法解析时，只有确认没有类型声明才以空的编译单元代替"""
+        extractor = JavaASTExtractor(logger=self.logger, max_workers=1, use_disk_cache=False)
+        tree, _ = extractor._parse_source(
+            'module-info.java',
+            '/** Exports every class of the module. */\nmodule com.ex {\n    exports com.ex;\n}\n')
+        self.assertEqual(tree.types, [])
+
+        with self.assertRaises(javalang.parser.JavaSyntaxError):
+            extractor._parse_source('A.java', 'package com.ex;\npublic class A { void f() { int x = ; } }')
+
+
+class TestParseDiff(unittest.TestCase):
+    """测试 git diff 解析"""
+
+    RENAME = """diff --git src://src/com/ex/Old.java dst://src/com/ex/New.java
+similarity index 88%
+rename from src/com/ex/Old.java
+rename to src/com/ex/New.java
+index 1111111..2222222 100644
+--- src://src/com/ex/Old.java
++++ dst://src/com/ex/New.java
+@@ -1,4 +1,4 @@
+ package com.ex;
+ 
+-public class Old {
++public class New {
+ }
+"""
+
+    ADDED_AND_DELETED = """diff --git src://com/ex/Added.java dst://com/ex/Added.java
+new file mode 100644
+index 0000000..3333333
+--- /dev/null
++++ dst://com/ex/Added.java
+@@ -0,0 +1,3 @@
++package com.ex;
++
++public class Added {}
+\\ No newline at end of file
+diff --git src://com/ex/Gone.java dst://com/ex/Gone.java
+deleted file mode 100644
+index 4444444..0000000
+--- src://com/ex/Gone.java
++++ /dev/null
+@@ -1,2 +0,0 @@
+-package com.ex;
+-public class Gone {}
+"""
+
+    NO_NEWLINE = """diff --git src://com/ex/A.java dst://com/ex/A.java
+index 5555555..6666666 100644
+--- src://com/ex/A.java
++++ dst://com/ex/A.java
+@@ -3,3 +3,4 @@ public class A {
+     void f() {
+     }
+-}
+\\ No newline at end of file
++    void g() {}
++}
+"""
+
+    MULTIPLE_HUNKS = """diff --git src://com/ex/A.java dst://com/ex/A.java
+index 5555555..6666666 100644
+--- src://com/ex/A.java
++++ dst://com/ex/A.java
+@@ -2,4 +2,5 @@ package com.ex;
+ public class A {
+     void f() {
++        g();
+     }
+@@ -20,5 +21,4 @@ public class A {
+     void h() {
+-        int x = 1;
+-        int y = 2;
++        int x = 2;
+     }
+@@ -40,2 +40,3 @@ public class A {
+     }
++    // end
+ }
+"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.extractor = JavaASTExtractor(logger=logging.getLogger('TestParseDiff'), max_workers=1)
+
+    def test_rename(self):
+        """测试重命名的文件：路径取 diff 头中的源路径，行号按新文件计算"""
+        self.assertEqual(self.extractor.parse_diff(self.RENAME),
+                         {os.path.join('com', 'ex', 'Old.java'): {'modified_lines': [3]}})
+
+    def test_dev_null(self):
+        """测试新增和删除的文件（--- /dev/null 与 +++ /dev/null）"""
+        self.assertEqual(self.extractor.parse_diff(self.ADDED_AND_DELETED), {
+            os.path.join('com', 'ex', 'Added.java'): {'modified_lines': [1, 2, 3]},
+            os.path.join('com', 'ex', 'Gone.java'): {'modified_lines': [0]},
+        })
+
+    def test_no_newline_at_end_of_file(self):
+        """测试 \\ No newline at end of file 不占用行号"""
+        self.assertEqual(self.extractor.parse_diff(self.NO_NEWLINE),
+                         {os.path.join('com', 'ex', 'A.java'): {'modified_lines': [5, 6]}})
+
+    def test_multiple_hunks(self):
+        """测试同一文件的多个块，块顺序颠倒或使用 CRLF 换行时结果相同"""
+        expected = {os.path.join('com', 'ex', 'A.java'): {'modified_lines': [4, 22, 41]}}
+        self.assertEqual(self.extractor.parse_diff(self.MULTIPLE_HUNKS), expected)
+        self.assertEqual(self.extractor.parse_diff(self.MULTIPLE_HUNKS.replace('\n', '\r\n')), expected)
+
+        header, *hunks = self.MULTIPLE_HUNKS.split('@@ -')
+        reordered = header + ''.join('@@ -' + hunk for hunk in reversed(hunks))
+        self.assertEqual(self.extractor.parse_diff(reordered), expected)
+
+
+class TestRangesTouchingLines(unittest.TestCase):
+    """测试按修改行查找方法范围"""
+
+    # 外部类的方法范围包含内部类的方法范围，输入顺序不按起始行排列
+    RANGES = [
+        ('Outer.run', 10, 30, '方法'),
+        ('Outer.Inner.call', 15, 20, '方法'),
+        ('Outer.init', 2, 5, '构造函数'),
+        ('Outer.stop', 32, 32, '方法'),
+    ]
+
+    def _touching(self, lines):
+        """返回命中的方法名，修改行少于和多于范围数时的两种算法结果必须一致"""
+        names = [item[0] for item in _ranges_touching_lines(self.RANGES, lines)]
+        padded = sorted(set(lines) | {100, 101, 102, 103, 104})
+        self.assertGreater(len(padded), len(self.RANGES))
+        self.assertEqual([item[0] for item in _ranges_touching_lines(self.RANGES, padded)], names)
+        return names
+
+    def test_empty_input(self):
+        """测试没有修改行或没有范围"""
+        self.assertEqual(_ranges_touching_lines(self.RANGES, []), [])
+        self.assertEqual(_ranges_touching_lines([], [1, 2, 3]), [])
+        self.assertEqual(self._touching([]), [])
+
+    def test_nested_ranges(self):
+        """测试内部类方法中的修改同时命中外部方法，结果保持输入顺序"""
+        self.assertEqual(self._touching([17]), ['Outer.run', 'Outer.Inner.call'])
+        self.assertEqual(self._touching([12]), ['Outer.run'])
+        self.assertEqual(self._touching([3, 17]), ['Outer.run', 'Outer.Inner.call', 'Outer.init'])
+
+    def test_boundary_lines(self):
+        """测试修改行位于范围的起始行或结束行"""
+        self.assertEqual(self._touching([15]), ['Outer.run', 'Outer.Inner.call'])
+        self.assertEqual(self._touching([20]), ['Outer.run', 'Outer.Inner.call'])
+        self.assertEqual(self._touching([2, 30]), ['Outer.run', 'Outer.init'])
+        self.assertEqual(self._touching([32]), ['Outer.stop'])
+        self.assertEqual(self._touching([1, 6, 9, 31, 33]), [])
+
+
+class TestIncrementalAnalysis(JavaProjectTestCase):
+    """测试 analyze_project 的增量分析"""
+
+    CALLER = """package com.ex;
+
+public class A {{
+    private B b = new B();
+
+    public void run() {{
+        b.{callee}();
+    }}
+}}"""
+
+    CALLEE = """package com.ex;
+
+public class B {
+    public void foo() {
+    }
+
+    public void bar() {
+    }
+}"""
+
+    SOURCES = {
+        'com/ex/A.java': CALLER.format(callee='foo'),
+        'com/ex/B.java': CALLEE,
+    }
+
+    def _analyze(self, changed_files=None, use_disk_cache=False):
+        """分析项目，返回调用关系 方法名 -> (调用者, 被调用者)"""
+        extractor = JavaASTExtractor(logger=self.logger, max_workers=1, use_disk_cache=use_disk_cache)
+        call_graph = extractor.analyze_project(self.src_root, changed_files=changed_files)
+        return {name: (sorted(edge['callers']), sorted(edge['callees']))
+                for name, edge in call_graph.edges.items()}
+
+    def test_changed_file_matches_full_rebuild(self):
+        """测试修改一个文件后增量分析的调用图与全部重新分析一致"""
+        first = self._analyze(changed_files=[], use_disk_cache=True)
+        self.assertIn('com.ex.B.foo', first['com.ex.A.run'][1])
+
+        # 文件大小不变时也要以 changed_files 为准重新分析
+        self.write_source('com/ex/A.java', self.CALLER.format(callee='bar'))
+        with self.assertLogs(self.logger, level='INFO') as logs:
+            incremental = self._analyze(changed_files=['com/ex/A.java'], use_disk_cache=True)
+        self.assertTrue(any('1 个文件复用了缓存的调用关系' in message for message in logs.output))
+
+        self.assertEqual(incremental, self._analyze())
+        self.assertEqual(incremental['com.ex.A.run'][1], ['com.ex.B.bar'])
+        self.assertEqual(incremental['com.ex.B.foo'][0], [])
+
+    def test_call_cache_requires_disk_cache(self):
+        """测试未开启 use_disk_cache 时增量分析不读写调用关系缓存"""
+        cache_file = os.path.join('analysis_results', 'call_graph.pkl')
+        self._analyze(changed_files=[])
+        self.assertFalse(os.path.exists(cache_file))
+
+        self._analyze(changed_files=[], use_disk_cache=True)
+        self.assertTrue(os.path.exists(cache_file))
+        self.write_source('com/ex/A.java', self.CALLER.format(callee='bar'))
+        with self.assertLogs(self.logger, level='INFO') as logs:
+            incremental = self._analyze(changed_files=['com/ex/A.java'])
+        self.assertTrue(any('0 个文件复用了缓存的调用关系' in message for message in logs.output))
+        self.assertEqual(incremental, self._analyze())
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file